@@ -92,6 +92,7 @@ resource "aws_iam_role_policy" "lambda_execution" {
         Effect = "Allow"
         Action = [
           "cloudwatch:GetMetricStatistics",
+          "cloudwatch:GetMetricData",
           "cloudwatch:PutMetricAlarm",
           "cloudwatch:DescribeAlarms"
         ]
@@ -104,7 +105,10 @@ resource "aws_iam_role_policy" "lambda_execution" {
           "dynamodb:GetItem",
           "dynamodb:UpdateItem",
           "dynamodb:Query",
-          "dynamodb:Scan"
+          "dynamodb:Scan",
+          "dynamodb:BatchGetItem",
+          # Buffered target health event writes (batch_writer)
+          "dynamodb:BatchWriteItem"
         ]
         Resource = [
           aws_dynamodb_table.target_health_events.arn,
@@ -1,4 +1,4 @@
-# Lambda layer for shared utilities
+# Lambda layer for shared utilities and the decision engine
 # Lambda layers require python/ directory structure
 data "archive_file" "utils_layer" {
   type        = "zip"
@@ -23,6 +23,26 @@ data "archive_file" "utils_layer" {
     content  = file("${path.module}/../../src/lambda/utils/helpers.py")
     filename = "python/utils/helpers.py"
   }
+  
+  source {
+    content  = file("${path.module}/../../src/lambda/utils/serialization.py")
+    filename = "python/utils/serialization.py"
+  }
+  
+  source {
+    content  = file("${path.module}/../../src/decision_engine/__init__.py")
+    filename = "python/decision_engine/__init__.py"
+  }
+  
+  source {
+    content  = file("${path.module}/../../src/decision_engine/decision_model.py")
+    filename = "python/decision_engine/decision_model.py"
+  }
+  
+  source {
+    content  = file("${path.module}/../../src/decision_engine/repair_priority.py")
+    filename = "python/decision_engine/repair_priority.py"
+  }
 }
 
 resource "aws_lambda_layer_version" "utils" {
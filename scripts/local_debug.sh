@@ -34,7 +34,7 @@ EOF
 fi
 
 # Set up Python path
-export PYTHONPATH="$PROJECT_ROOT/src/lambda:$PYTHONPATH"
+export PYTHONPATH="$PROJECT_ROOT/src/lambda:$PROJECT_ROOT/src:$PYTHONPATH"
 
 # Set environment variables
 export AWS_REGION="${AWS_REGION:-us-east-1}"
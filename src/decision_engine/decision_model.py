@@ -1,9 +1,10 @@
 """Decision model for auto-heal actions."""
 from typing import Dict, Any, Optional
 from .repair_priority import (
-    calculate_repair_priority,
-    should_skip_repair,
-    get_repair_timeout
+    TIMEOUT_BY_ID,
+    classification_id,
+    priority_for_id,
+    skip_repair_for_id
 )
 
 
@@ -20,8 +21,50 @@ def should_replace_instance(diagnostic_score: float, repair_attempts: int) -> bo
     return False
 
 
+def make_decision(
+    instance_id: str,
+    classification: str,
+    diagnostic_score: float,
+    repair_attempts: int,
+    instance_config: Dict[str, Any]
+) -> Dict[str, Any]:
+    """Make auto-heal decision."""
+    # Resolve classification once and share the repair_priority rules by id
+    cid = classification_id(classification)
+    
+    decision = {
+        'instance_id': instance_id,
+        'action': None,
+        'reason': '',
+        'priority': 0,
+        'timeout_seconds': 0,
+        'skip': False
+    }
+    
+    # Check if should skip
+    if skip_repair_for_id(cid, diagnostic_score, instance_config):
+        decision['skip'] = True
+        decision['reason'] = 'Skipped per configuration or unrecoverable state'
+        return decision
+    
+    # Calculate priority
+    decision['priority'] = priority_for_id(cid, diagnostic_score, repair_attempts)
+    
+    # Decide: repair or replace
+    if should_replace_instance(diagnostic_score, repair_attempts):
+        decision['action'] = 'replace'
+        decision['reason'] = f'Diagnostic score {diagnostic_score:.1f} and {repair_attempts} repair attempts indicate replacement needed'
+        decision['timeout_seconds'] = 1800  # 30 minutes for replacement
+    else:
+        decision['action'] = 'repair'
+        decision['reason'] = f'Attempting repair for {classification} (score: {diagnostic_score:.1f})'
+        decision['timeout_seconds'] = TIMEOUT_BY_ID[cid]
+    
+    return decision
+
+
 class AutoHealDecision:
-    """Auto-heal decision model."""
+    """Auto-heal decision model (thin wrapper around make_decision)."""
     
     def __init__(
         self,
@@ -39,66 +82,10 @@ class AutoHealDecision:
     
     def decide(self) -> Dict[str, Any]:
         """Make auto-heal decision."""
-        decision = {
-            'instance_id': self.instance_id,
-            'action': None,
-            'reason': '',
-            'priority': 0,
-            'timeout_seconds': 0,
-            'skip': False
-        }
-        
-        # Check if should skip
-        if should_skip_repair(
+        return make_decision(
+            self.instance_id,
             self.classification,
             self.diagnostic_score,
+            self.repair_attempts,
             self.instance_config
-        ):
-            decision['skip'] = True
-            decision['reason'] = 'Skipped per configuration or unrecoverable state'
-            return decision
-        
-        # Calculate priority
-        priority = calculate_repair_priority(
-            self.classification,
-            self.diagnostic_score,
-            self.repair_attempts
-        )
-        decision['priority'] = priority
-        
-        # Decide: repair or replace
-        should_replace = should_replace_instance(
-            self.diagnostic_score,
-            self.repair_attempts
         )
-        
-        if should_replace:
-            decision['action'] = 'replace'
-            decision['reason'] = f'Diagnostic score {self.diagnostic_score:.1f} and {self.repair_attempts} repair attempts indicate replacement needed'
-            decision['timeout_seconds'] = 1800  # 30 minutes for replacement
-        else:
-            decision['action'] = 'repair'
-            decision['reason'] = f'Attempting repair for {self.classification} (score: {self.diagnostic_score:.1f})'
-            decision['timeout_seconds'] = get_repair_timeout(self.classification)
-        
-        return decision
-
-
-def make_decision(
-    instance_id: str,
-    classification: str,
-    diagnostic_score: float,
-    repair_attempts: int,
-    instance_config: Dict[str, Any]
-) -> Dict[str, Any]:
-    """Make auto-heal decision."""
-    decision_model = AutoHealDecision(
-        instance_id=instance_id,
-        classification=classification,
-        diagnostic_score=diagnostic_score,
-        repair_attempts=repair_attempts,
-        instance_config=instance_config
-    )
-    
-    return decision_model.decide()
-
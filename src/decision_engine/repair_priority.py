@@ -23,6 +23,56 @@ PRIORITY_MAP = {
 }
 
 
+REPAIR_TIMEOUTS = {
+    'Application Failure': 300,  # 5 minutes
+    'Resource Bottleneck': 600,  # 10 minutes
+    'Agent Failure': 900,  # 15 minutes
+    'Network Degradation': 600,
+    'OS-level Failure': 0,  # Should not repair
+    'Disk Corruption': 0,  # Should not repair
+    'Unknown State': 300
+}
+
+
+# Classifications that always require replacement rather than repair
+NO_REPAIR_CLASSIFICATIONS = frozenset({'OS-level Failure', 'Disk Corruption'})
+
+
+# Small-int ids per classification, with per-id tables derived from the maps above
+CLASSIFICATION_IDS = {classification: i for i, classification in enumerate(PRIORITY_MAP)}
+UNKNOWN_CLASSIFICATION_ID = CLASSIFICATION_IDS['Unknown State']
+PRIORITY_BY_ID = tuple(int(priority) for priority in PRIORITY_MAP.values())
+TIMEOUT_BY_ID = tuple(REPAIR_TIMEOUTS.get(classification, 300) for classification in PRIORITY_MAP)
+SKIP_BY_ID = tuple(classification in NO_REPAIR_CLASSIFICATIONS for classification in PRIORITY_MAP)
+
+
+def classification_id(classification: str) -> int:
+    """Map classification to its id; unrecognized values map to Unknown State."""
+    return CLASSIFICATION_IDS.get(classification, UNKNOWN_CLASSIFICATION_ID)
+
+
+def priority_for_id(cid: int, diagnostic_score: float, repair_attempts: int) -> int:
+    """Calculate repair priority for a classification id (lower = higher priority)."""
+    # Very low scores and repeated failed repairs escalate to critical
+    if diagnostic_score < 20 or repair_attempts >= 2:
+        return int(FailurePriority.CRITICAL)
+    if diagnostic_score < 40:
+        return min(PRIORITY_BY_ID[cid], int(FailurePriority.HIGH))
+    return PRIORITY_BY_ID[cid]
+
+
+def skip_repair_for_id(cid: int, diagnostic_score: float, instance_config: Dict[str, Any]) -> bool:
+    """Determine if repair should be skipped for a classification id."""
+    # Checks run cheapest first; any one of them is sufficient
+    # Skip if diagnostic score is extremely low (likely unrecoverable),
+    # the classification indicates replacement, or it is explicitly configured
+    return (
+        diagnostic_score < 10
+        or SKIP_BY_ID[cid]
+        or bool(instance_config.get('skip_recovery', False))
+    )
+
+
 def calculate_repair_priority(
     classification: str,
     diagnostic_score: float,
@@ -33,19 +83,7 @@ def calculate_repair_priority(
     
     Returns priority value (lower = higher priority).
     """
-    base_priority = PRIORITY_MAP.get(classification, FailurePriority.UNKNOWN)
-    
-    # Adjust based on diagnostic score
-    if diagnostic_score < 20:
-        base_priority = FailurePriority.CRITICAL
-    elif diagnostic_score < 40:
-        base_priority = min(base_priority, FailurePriority.HIGH)
-    
-    # Adjust based on repair attempts
-    if repair_attempts >= 2:
-        base_priority = FailurePriority.CRITICAL
-    
-    return int(base_priority)
+    return priority_for_id(classification_id(classification), diagnostic_score, repair_attempts)
 
 
 def should_skip_repair(
@@ -54,32 +92,9 @@ def should_skip_repair(
     instance_config: Dict[str, Any]
 ) -> bool:
     """Determine if repair should be skipped."""
-    # Skip if explicitly configured
-    if instance_config.get('skip_recovery', False):
-        return True
-    
-    # Skip if diagnostic score is extremely low (likely unrecoverable)
-    if diagnostic_score < 10:
-        return True
-    
-    # Skip if classification indicates replacement needed
-    if classification in ['OS-level Failure', 'Disk Corruption']:
-        return True
-    
-    return False
+    return skip_repair_for_id(classification_id(classification), diagnostic_score, instance_config)
 
 
 def get_repair_timeout(classification: str) -> int:
     """Get repair timeout in seconds based on classification."""
-    timeouts = {
-        'Application Failure': 300,  # 5 minutes
-        'Resource Bottleneck': 600,  # 10 minutes
-        'Agent Failure': 900,  # 15 minutes
-        'Network Degradation': 600,
-        'OS-level Failure': 0,  # Should not repair
-        'Disk Corruption': 0,  # Should not repair
-        'Unknown State': 300
-    }
-    
-    return timeouts.get(classification, 300)
-
+    return TIMEOUT_BY_ID[classification_id(classification)]
@@ -1,17 +1,24 @@
 """Auto-heal Lambda handler for repair and replacement."""
-import json
 import os
-from typing import Dict, Any, Optional
+import time
+from concurrent.futures import ThreadPoolExecutor, wait
+from typing import Dict, Any, List, Optional, Tuple
 from datetime import datetime, timedelta
+from decimal import Decimal
+from boto3.dynamodb.types import TypeDeserializer
 from utils.aws_clients import (
     get_elbv2_client,
     get_ec2_client,
     get_autoscaling_client,
     get_ssm_client,
-    get_dynamodb_resource
+    get_dynamodb_client,
+    get_dynamodb_resource,
+    get_events_client
 )
-from utils.logger import get_logger
-from utils.helpers import should_replace_instance
+from utils.logger import get_logger, LazyJSON
+from utils.helpers import iso_now
+from utils.serialization import dumps, loads
+from decision_engine.decision_model import make_decision
 
 logger = get_logger(__name__)
 
@@ -20,6 +27,34 @@ AUTO_HEAL_TABLE = os.environ.get('AUTO_HEAL_TABLE', 'AutoHealHistory')
 INSTANCE_CONFIG_TABLE = os.environ.get('INSTANCE_CONFIG_TABLE', 'InstanceConfig')
 SSM_REPAIR_DOCUMENT = os.environ.get('SSM_REPAIR_DOCUMENT', 'AutoHeal-RepairServices')
 EVENT_BUS_NAME = os.environ.get('EVENT_BUS_NAME', 'default')
+REPAIR_HISTORY_WINDOW_HOURS = int(os.environ.get('REPAIR_HISTORY_WINDOW_HOURS', '24'))
+
+_TTL_DELTA_SEC = 90 * 86400  # 90 days
+_EVENT_ENTRY_TEMPLATE = {
+    'Source': 'auto-heal.auto-heal',
+    'DetailType': 'Auto-Heal Complete',
+    'EventBusName': EVENT_BUS_NAME
+}
+
+# AWS clients are created once per container and reused across warm invocations
+_ELBV2 = get_elbv2_client()
+_EC2 = get_ec2_client()
+_AUTOSCALING = get_autoscaling_client()
+_SSM = get_ssm_client()
+_DDB = get_dynamodb_resource()
+_DDB_CLIENT = get_dynamodb_client()
+_EVENTS = get_events_client()
+_AUTO_HEAL_TBL = _DDB.Table(AUTO_HEAL_TABLE)
+_INSTANCE_CFG_TBL = _DDB.Table(INSTANCE_CONFIG_TABLE)
+
+# Instance config rarely changes, so cache lookups for the life of the container
+_CONFIG_TTL_SEC = 300
+_CONFIG_CACHE_MAX_ENTRIES = 1024
+_CONFIG_CACHE: Dict[str, Tuple[float, Dict[str, Any]]] = {}
+_DESERIALIZER = TypeDeserializer()
+
+# Shared pool for overlapping independent AWS calls (boto3 releases the GIL on I/O)
+_IO_POOL = ThreadPoolExecutor(max_workers=2)
 
 
 def lambda_handler(event: Dict[str, Any], context: Any) -> Dict[str, Any]:
@@ -30,7 +65,7 @@ def lambda_handler(event: Dict[str, Any], context: Any) -> Dict[str, Any]:
     - EventBridge event from diagnostics
     - Manual invocation
     """
-    logger.info("Auto-heal handler started", event=json.dumps(event))
+    logger.info("Auto-heal handler started", event=LazyJSON(event))
     
     try:
         # Extract information from event
@@ -43,50 +78,67 @@ def lambda_handler(event: Dict[str, Any], context: Any) -> Dict[str, Any]:
             logger.error("No instance ID in event")
             return {'statusCode': 400, 'body': 'Missing instance_id'}
         
-        # Check instance configuration
-        instance_config = _get_instance_config(instance_id)
+        # Fetch instance configuration and auto-heal history concurrently;
+        # the history serves both the cooldown and repair attempt checks
+        config_future = _IO_POOL.submit(_get_instance_config, instance_id)
+        history_future = _IO_POOL.submit(_get_instance_history, instance_id)
+        instance_config = config_future.result()
+        history = history_future.result()
         
         if instance_config.get('skip_recovery', False):
             logger.info("Recovery skipped for instance", instance_id=instance_id)
             return {'statusCode': 200, 'body': 'Recovery skipped per configuration'}
         
         # Check cooldown period
-        if _is_in_cooldown(instance_id, instance_config):
+        if _is_in_cooldown(history, instance_config):
             logger.info("Instance in cooldown period", instance_id=instance_id)
             return {'statusCode': 200, 'body': 'Instance in cooldown period'}
         
         # Get repair attempts
-        repair_attempts = _get_repair_attempts(instance_id)
+        repair_attempts = _get_repair_attempts(instance_config, history)
         
-        # Decide: repair or replace
-        should_replace = should_replace_instance(diagnostic_score, repair_attempts)
+        # Decide: repair or replace, reusing the config fetched above.
+        # A skipped repair means the instance is unrecoverable in place
+        # (skip_recovery already returned early), so it is replaced.
+        decision = make_decision(
+            instance_id,
+            classification,
+            diagnostic_score,
+            repair_attempts,
+            instance_config
+        )
         
-        if should_replace:
-            logger.info("Replacing instance", instance_id=instance_id)
+        if decision['skip'] or decision['action'] == 'replace':
+            logger.info("Replacing instance", instance_id=instance_id, reason=decision['reason'])
             result = _replace_instance(instance_id, target_group_arn, classification, diagnostic_score)
         else:
-            logger.info("Attempting repair", instance_id=instance_id)
+            logger.info("Attempting repair", instance_id=instance_id, reason=decision['reason'])
             result = _repair_instance(instance_id, target_group_arn, classification, diagnostic_score)
         
-        # Record auto-heal action
-        _record_auto_heal_action(
-            instance_id=instance_id,
-            target_group_arn=target_group_arn,
-            action=result['action'],
-            result=result,
-            classification=classification,
-            diagnostic_score=diagnostic_score
-        )
-        
-        # Trigger verification
+        # Record auto-heal action and trigger verification concurrently
+        pending = [
+            _IO_POOL.submit(
+                _record_auto_heal_action,
+                instance_id=instance_id,
+                target_group_arn=target_group_arn,
+                action=result['action'],
+                result=result,
+                classification=classification,
+                diagnostic_score=diagnostic_score,
+                repair_attempts=repair_attempts
+            )
+        ]
         if result.get('success'):
-            _trigger_verification(instance_id, target_group_arn, result)
+            pending.append(_IO_POOL.submit(_trigger_verification, instance_id, target_group_arn, result))
+        
+        # Both must finish before returning, or the container may freeze mid-request
+        wait(pending, timeout=_remaining_seconds(context))
         
         logger.info("Auto-heal completed", instance_id=instance_id, action=result['action'])
         
         return {
             'statusCode': 200,
-            'body': json.dumps(result)
+            'body': dumps(result)
         }
     
     except Exception as e:
@@ -94,86 +146,183 @@ def lambda_handler(event: Dict[str, Any], context: Any) -> Dict[str, Any]:
         raise
 
 
+def _remaining_seconds(context: Any, reserve_ms: int = 500) -> Optional[float]:
+    """Seconds left in the invocation, minus a reserve for returning."""
+    if context is None or not hasattr(context, 'get_remaining_time_in_millis'):
+        return None
+    return max(0.0, (context.get_remaining_time_in_millis() - reserve_ms) / 1000.0)
+
+
 def _extract_instance_id(event: Dict[str, Any]) -> Optional[str]:
     """Extract instance ID from event."""
-    if 'instance_id' in event:
-        return event['instance_id']
+    # Direct instance_id
+    instance_id = event.get('instance_id')
+    if instance_id:
+        return instance_id
     
-    if 'detail' in event:
-        detail = event['detail']
-        if isinstance(detail, str):
-            detail = json.loads(detail)
-        return detail.get('instance_id')
-    
-    return None
+    # From EventBridge detail
+    detail = event.get('detail')
+    if isinstance(detail, str):
+        detail = loads(detail)
+    return detail.get('instance_id') if isinstance(detail, dict) else None
 
 
 def _get_instance_config(instance_id: str) -> Dict[str, Any]:
-    """Get instance configuration from DynamoDB."""
-    dynamodb = get_dynamodb_resource()
-    table = dynamodb.Table(INSTANCE_CONFIG_TABLE)
+    """Get instance configuration from DynamoDB (cached for _CONFIG_TTL_SEC)."""
+    entry = _CONFIG_CACHE.get(instance_id)
+    if entry and time.monotonic() - entry[0] < _CONFIG_TTL_SEC:
+        return entry[1]
     
     try:
-        response = table.get_item(Key={'InstanceId': instance_id})
-        return response.get('Item', {})
+        # Low-level client: only the fields we use
+        response = _DDB_CLIENT.get_item(
+            TableName=INSTANCE_CONFIG_TABLE,
+            Key={'InstanceId': {'S': instance_id}},
+            ProjectionExpression='skip_recovery, cooldown_minutes, RepairAttempts, LastActionTs'
+        )
     except Exception as e:
         logger.debug("Failed to get instance config", error=str(e))
         return {}
+    
+    item = _normalize_instance_config(response.get('Item', {}), typed=True)
+    _cache_instance_config(instance_id, item)
+    return item
 
 
-def _is_in_cooldown(instance_id: str, config: Dict[str, Any]) -> bool:
-    """Check if instance is in cooldown period."""
-    cooldown_minutes = config.get('cooldown_minutes', 15)
+def _normalize_instance_config(raw: Dict[str, Any], typed: bool = False) -> Dict[str, Any]:
+    """Coerce config attributes to the types the handler expects.
     
-    dynamodb = get_dynamodb_resource()
-    table = dynamodb.Table(AUTO_HEAL_TABLE)
+    Each attribute is decoded on its own, so one value stored with an
+    unexpected type (e.g. a number written as a string) is dropped without
+    losing the rest of the config.
+    """
+    item = {}
+    for name, coerce in _CONFIG_COERCERS.items():
+        if name not in raw:
+            continue
+        try:
+            value = _DESERIALIZER.deserialize(raw[name]) if typed else raw[name]
+            item[name] = coerce(value)
+        except Exception as e:
+            logger.debug("Ignoring malformed config attribute", attribute=name, error=str(e))
+    return item
+
+
+def _as_bool(value: Any) -> bool:
+    """Interpret a stored flag, accepting strings such as 'true' as well as BOOL."""
+    if isinstance(value, str):
+        return value.strip().lower() in ('true', 'yes', '1')
+    return bool(value)
+
+
+def _as_int(value: Any) -> int:
+    """Interpret a stored count, accepting numeric strings as well as N."""
+    return int(Decimal(str(value)))
+
+
+_CONFIG_COERCERS = {
+    'skip_recovery': _as_bool,
+    'cooldown_minutes': float,
+    'RepairAttempts': _as_int,
+    'LastActionTs': float
+}
+
+
+def _cache_instance_config(instance_id: str, item: Dict[str, Any]):
+    """Store instance configuration in the in-memory cache."""
+    _CONFIG_CACHE.pop(instance_id, None)
+    if len(_CONFIG_CACHE) >= _CONFIG_CACHE_MAX_ENTRIES:
+        # Evict the oldest entry (dicts preserve insertion order)
+        _CONFIG_CACHE.pop(next(iter(_CONFIG_CACHE)))
+    _CONFIG_CACHE[instance_id] = (time.monotonic(), item)
+
+
+def _get_instance_history(
+    instance_id: str,
+    limit: int = 50,
+    window_hours: int = REPAIR_HISTORY_WINDOW_HOURS
+) -> List[Dict[str, Any]]:
+    """Get recent auto-heal actions for instance, newest first."""
+    # Bound the sort key so DynamoDB only reads the recent window
+    since = (datetime.utcnow() - timedelta(hours=window_hours)).isoformat() + 'Z'
     
     try:
-        # Get last auto-heal action
-        response = table.query(
+        response = _DDB_CLIENT.query(
+            TableName=AUTO_HEAL_TABLE,
             IndexName='InstanceId-Timestamp-index',
-            KeyConditionExpression='InstanceId = :instance_id',
-            ExpressionAttributeValues={':instance_id': instance_id},
+            KeyConditionExpression='InstanceId = :instance_id AND #ts >= :since',
+            ExpressionAttributeValues={
+                ':instance_id': {'S': instance_id},
+                ':since': {'S': since}
+            },
+            ProjectionExpression='#ts, #epoch, #act',
+            ExpressionAttributeNames={
+                '#ts': 'Timestamp',
+                '#epoch': 'TimestampEpoch',
+                '#act': 'Action'
+            },
             ScanIndexForward=False,
-            Limit=1
+            Limit=limit
         )
         
-        items = response.get('Items', [])
-        if not items:
-            return False
-        
-        last_action_time = datetime.fromisoformat(items[0]['Timestamp'].replace('Z', '+00:00'))
-        time_since_last_action = datetime.utcnow().replace(tzinfo=last_action_time.tzinfo) - last_action_time
+        history = []
+        for raw in response.get('Items', []):
+            item = {
+                'Timestamp': raw.get('Timestamp', {}).get('S', ''),
+                'Action': raw.get('Action', {}).get('S', '')
+            }
+            if 'TimestampEpoch' in raw:
+                item['TimestampEpoch'] = float(raw['TimestampEpoch']['N'])
+            history.append(item)
         
-        return time_since_last_action.total_seconds() < (cooldown_minutes * 60)
+        return history
     
     except Exception as e:
-        logger.debug("Cooldown check failed", error=str(e))
-        return False
+        logger.debug("Failed to get auto-heal history", error=str(e))
+        return []
 
 
-def _get_repair_attempts(instance_id: str) -> int:
-    """Get number of repair attempts for instance."""
-    dynamodb = get_dynamodb_resource()
-    table = dynamodb.Table(AUTO_HEAL_TABLE)
+def _is_in_cooldown(history: List[Dict[str, Any]], config: Dict[str, Any]) -> bool:
+    """Check if instance is in cooldown period."""
+    cooldown_seconds = float(config.get('cooldown_minutes', 15)) * 60
+    
+    if not history:
+        return False
     
     try:
-        response = table.query(
-            IndexName='InstanceId-Timestamp-index',
-            KeyConditionExpression='InstanceId = :instance_id',
-            FilterExpression='Action = :action',
-            ExpressionAttributeValues={
-                ':instance_id': instance_id,
-                ':action': 'repair'
-            },
-            ScanIndexForward=False
-        )
+        # History is newest first, so the head is the last auto-heal action
+        last_action = history[0]
+        if 'TimestampEpoch' in last_action:
+            last_action_epoch = float(last_action['TimestampEpoch'])
+        else:
+            # Records written before TimestampEpoch existed only carry the ISO string
+            last_action_epoch = datetime.fromisoformat(
+                last_action['Timestamp'][:-1] + '+00:00'
+            ).timestamp()
         
-        return len(response.get('Items', []))
+        return time.time() - last_action_epoch < cooldown_seconds
     
     except Exception as e:
-        logger.debug("Failed to get repair attempts", error=str(e))
-        return 0
+        logger.debug("Cooldown check failed", error=str(e))
+        return False
+
+
+def _get_repair_attempts(config: Dict[str, Any], history: List[Dict[str, Any]]) -> int:
+    """Get number of repair attempts for instance."""
+    # RepairAttempts is maintained atomically by _record_auto_heal_action and
+    # only counts while the last action falls inside the history window
+    if 'RepairAttempts' in config and _within_repair_window(config.get('LastActionTs')):
+        return int(config['RepairAttempts'])
+    
+    # Counter missing or stale: count from the (already windowed) history
+    return sum(1 for item in history if item.get('Action') == 'repair')
+
+
+def _within_repair_window(last_action_ts: Optional[float]) -> bool:
+    """Check whether a LastActionTs epoch falls inside REPAIR_HISTORY_WINDOW_HOURS."""
+    if last_action_ts is None:
+        return False
+    return time.time() - float(last_action_ts) < REPAIR_HISTORY_WINDOW_HOURS * 3600
 
 
 def _repair_instance(
@@ -183,22 +332,19 @@ def _repair_instance(
     diagnostic_score: float
 ) -> Dict[str, Any]:
     """Attempt to repair instance via SSM."""
-    ssm = get_ssm_client()
-    elbv2 = get_elbv2_client()
-    
     result = {
         'action': 'repair',
         'instance_id': instance_id,
         'success': False,
         'steps': [],
-        'timestamp': datetime.utcnow().isoformat() + 'Z'
+        'timestamp': iso_now()[0]
     }
     
     try:
         # Step 1: Deregister from target group
         logger.info("Deregistering instance from target group", instance_id=instance_id)
         try:
-            elbv2.deregister_targets(
+            _ELBV2.deregister_targets(
                 TargetGroupArn=target_group_arn,
                 Targets=[{'Id': instance_id}]
             )
@@ -217,7 +363,7 @@ def _repair_instance(
         # Step 2: Run SSM repair document
         logger.info("Running SSM repair document", instance_id=instance_id)
         try:
-            response = ssm.start_automation_execution(
+            response = _SSM.start_automation_execution(
                 DocumentName=SSM_REPAIR_DOCUMENT,
                 Parameters={
                     'InstanceId': [instance_id],
@@ -259,17 +405,13 @@ def _replace_instance(
     diagnostic_score: float
 ) -> Dict[str, Any]:
     """Replace instance via Auto Scaling Group."""
-    elbv2 = get_elbv2_client()
-    autoscaling = get_autoscaling_client()
-    ec2 = get_ec2_client()
-    
     result = {
         'action': 'replace',
         'instance_id': instance_id,
         'replacement_instance_id': None,
         'success': False,
         'steps': [],
-        'timestamp': datetime.utcnow().isoformat() + 'Z'
+        'timestamp': iso_now()[0]
     }
     
     try:
@@ -285,7 +427,7 @@ def _replace_instance(
         # Step 2: Deregister from target group
         logger.info("Deregistering instance from target group", instance_id=instance_id)
         try:
-            elbv2.deregister_targets(
+            _ELBV2.deregister_targets(
                 TargetGroupArn=target_group_arn,
                 Targets=[{'Id': instance_id}]
             )
@@ -302,7 +444,7 @@ def _replace_instance(
             })
         
         # Step 3: Get current ASG capacity
-        asg_response = autoscaling.describe_auto_scaling_groups(
+        asg_response = _AUTOSCALING.describe_auto_scaling_groups(
             AutoScalingGroupNames=[asg_name]
         )
         asg = asg_response['AutoScalingGroups'][0]
@@ -312,7 +454,7 @@ def _replace_instance(
         # Step 4: Terminate instance (ASG will replace it)
         logger.info("Terminating instance", instance_id=instance_id)
         try:
-            ec2.terminate_instances(InstanceIds=[instance_id])
+            _EC2.terminate_instances(InstanceIds=[instance_id])
             result['steps'].append({
                 'step': 'terminate_instance',
                 'status': 'success'
@@ -337,7 +479,7 @@ def _replace_instance(
         if desired_capacity <= min_size:
             logger.info("Increasing desired capacity to maintain min", asg_name=asg_name)
             try:
-                autoscaling.set_desired_capacity(
+                _AUTOSCALING.set_desired_capacity(
                     AutoScalingGroupName=asg_name,
                     DesiredCapacity=desired_capacity + 1,
                     HonorCooldown=False
@@ -360,10 +502,8 @@ def _replace_instance(
 
 def _get_asg_for_instance(instance_id: str) -> Optional[str]:
     """Get Auto Scaling Group name for instance."""
-    autoscaling = get_autoscaling_client()
-    
     try:
-        response = autoscaling.describe_auto_scaling_instances(
+        response = _AUTOSCALING.describe_auto_scaling_instances(
             InstanceIds=[instance_id]
         )
         
@@ -383,32 +523,82 @@ def _record_auto_heal_action(
     action: str,
     result: Dict[str, Any],
     classification: str,
-    diagnostic_score: float
+    diagnostic_score: float,
+    repair_attempts: int = 0
 ):
     """Record auto-heal action to DynamoDB."""
-    dynamodb = get_dynamodb_resource()
-    table = dynamodb.Table(AUTO_HEAL_TABLE)
+    # Single clock read so ActionId, Timestamp and TTL always agree
+    now_iso, now_epoch = iso_now()
     
     try:
-        # Convert float to Decimal for DynamoDB compatibility
-        from decimal import Decimal
-        
-        table.put_item(
+        _AUTO_HEAL_TBL.put_item(
             Item={
-                'ActionId': f"{instance_id}#{datetime.utcnow().isoformat()}",
+                'ActionId': f"{instance_id}#{now_iso[:-1]}",
                 'InstanceId': instance_id,
                 'TargetGroupArn': target_group_arn,
                 'Action': action,
                 'Result': result,
                 'Classification': classification,
+                # Convert float to Decimal for DynamoDB compatibility
                 'DiagnosticScore': Decimal(str(round(diagnostic_score, 2))),
-                'Timestamp': datetime.utcnow().isoformat() + 'Z',
-                'TTL': int((datetime.utcnow() + timedelta(days=90)).timestamp())
+                'Timestamp': now_iso,
+                'TimestampEpoch': Decimal(now_epoch),
+                'TTL': now_epoch + _TTL_DELTA_SEC
             }
         )
         logger.info("Auto-heal action recorded", instance_id=instance_id, action=action)
     except Exception as e:
         logger.error("Failed to record auto-heal action", error=str(e))
+        return
+    
+    try:
+        response = _update_repair_attempts(instance_id, action, repair_attempts, now_epoch)
+        # Keep the cached config in step with the counter we just wrote
+        _cache_instance_config(
+            instance_id,
+            _normalize_instance_config(response.get('Attributes', {}))
+        )
+    except Exception as e:
+        logger.error("Failed to update repair attempts", error=str(e))
+
+
+def _update_repair_attempts(
+    instance_id: str,
+    action: str,
+    repair_attempts: int,
+    now_epoch: int
+) -> Dict[str, Any]:
+    """Advance the windowed RepairAttempts counter for an auto-heal action."""
+    if action == 'repair':
+        try:
+            # Atomic increment, but only on a counter that is still inside the window
+            return _INSTANCE_CFG_TBL.update_item(
+                Key={'InstanceId': instance_id},
+                UpdateExpression='ADD RepairAttempts :one SET LastActionTs = :ts',
+                ConditionExpression='attribute_exists(RepairAttempts) AND LastActionTs >= :since',
+                ExpressionAttributeValues={
+                    ':one': Decimal(1),
+                    ':ts': Decimal(now_epoch),
+                    ':since': Decimal(now_epoch - REPAIR_HISTORY_WINDOW_HOURS * 3600)
+                },
+                ReturnValues='ALL_NEW'
+            )
+        except _INSTANCE_CFG_TBL.meta.client.exceptions.ConditionalCheckFailedException:
+            # Counter missing or stale: seed it from the windowed history count
+            count = repair_attempts + 1
+    else:
+        # A replacement is a fresh instance, so the repair count starts over
+        count = 0
+    
+    return _INSTANCE_CFG_TBL.update_item(
+        Key={'InstanceId': instance_id},
+        UpdateExpression='SET RepairAttempts = :count, LastActionTs = :ts',
+        ExpressionAttributeValues={
+            ':count': Decimal(count),
+            ':ts': Decimal(now_epoch)
+        },
+        ReturnValues='ALL_NEW'
+    )
 
 
 def _trigger_verification(
@@ -417,26 +607,40 @@ def _trigger_verification(
     result: Dict[str, Any]
 ):
     """Trigger verification process via EventBridge."""
-    import boto3
-    eventbridge = boto3.client('events')
-    
     try:
-        eventbridge.put_events(
-            Entries=[
-                {
-                    'Source': 'auto-heal.auto-heal',
-                    'DetailType': 'Auto-Heal Complete',
-                    'Detail': json.dumps({
-                        'instance_id': instance_id,
-                        'target_group_arn': target_group_arn,
-                        'action': result.get('action'),
-                        'result': result
-                    }),
-                    'EventBusName': EVENT_BUS_NAME
-                }
-            ]
-        )
+        entry = dict(_EVENT_ENTRY_TEMPLATE)
+        entry['Detail'] = dumps({
+            'instance_id': instance_id,
+            'target_group_arn': target_group_arn,
+            'action': result.get('action'),
+            'result': result
+        })
+        _EVENTS.put_events(Entries=[entry])
         logger.info("Verification triggered", instance_id=instance_id)
     except Exception as e:
         logger.error("Failed to trigger verification", error=str(e))
 
+
+def _warm_clients():
+    """Open connections and load service models during the Lambda init phase."""
+    warmups = [
+        # GetItem on a key that never exists: allowed by the role and reads no data
+        lambda: _DDB_CLIENT.get_item(
+            TableName=INSTANCE_CONFIG_TABLE,
+            Key={'InstanceId': {'S': '__warmup__'}},
+            ProjectionExpression='InstanceId'
+        ),
+        lambda: _SSM.describe_instance_information(MaxResults=5),
+        lambda: _AUTOSCALING.describe_auto_scaling_groups(MaxRecords=1),
+    ]
+    for warmup in warmups:
+        try:
+            warmup()
+        except Exception as e:
+            # Warmup is best effort; never fail container init
+            logger.debug("Client warmup failed", error=str(e))
+
+
+# Only warm inside Lambda so local imports stay side-effect free
+if os.environ.get('AWS_LAMBDA_FUNCTION_NAME'):
+    _warm_clients()
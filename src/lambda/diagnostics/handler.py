@@ -1,21 +1,62 @@
 """SSM-driven diagnostics Lambda handler."""
-import json
+import gzip
 import os
-from typing import Dict, Any, List, Optional
-from datetime import datetime, timedelta
+import time
+from concurrent.futures import ThreadPoolExecutor, wait
+from typing import Dict, Any, List, Optional, Tuple
 from utils.aws_clients import (
     get_ssm_client,
     get_ec2_client,
-    get_dynamodb_resource
+    get_dynamodb_client,
+    get_events_client
 )
 from utils.logger import get_logger
-from utils.helpers import calculate_diagnostic_score
+from utils.helpers import calculate_diagnostic_score, iso_now
+from utils.serialization import dumps, loads
 
 logger = get_logger(__name__)
 
 # Environment variables
 DIAGNOSTICS_TABLE = os.environ.get('DIAGNOSTICS_TABLE', 'DiagnosticsHistory')
 SSM_DIAGNOSTICS_DOCUMENT = os.environ.get('SSM_DIAGNOSTICS_DOCUMENT', 'AutoHeal-Diagnostics')
+DIAGNOSTICS_TIMEOUT_SECONDS = int(os.environ.get('DIAGNOSTICS_TIMEOUT_SECONDS', '60'))
+EVENT_BUS_NAME = os.environ.get('EVENT_BUS_NAME', 'default')
+
+# AWS clients are created once per container and reused across warm invocations
+_SSM = get_ssm_client()
+_EC2 = get_ec2_client()
+_EVENTS = get_events_client()
+_DDB_CLIENT = get_dynamodb_client()
+
+# Shared pool for the independent diagnostic checks, reused across warm invocations
+_DIAGNOSTICS_POOL = ThreadPoolExecutor(max_workers=8)
+
+_DIAGNOSTICS_TTL_SECONDS = 90 * 24 * 3600
+
+# Entries PutEvents reports as failed are retried with backoff
+_PUT_EVENTS_MAX_ATTEMPTS = 3
+
+# SSM command polling: exponential backoff from 50ms, capped at 2s per sleep
+_COMMAND_MAX_WAIT_SECONDS = 30
+_COMMAND_POLL_INITIAL_SECONDS = 0.05
+_COMMAND_POLL_MAX_SECONDS = 2.0
+_TERMINAL_COMMAND_STATUSES = frozenset({'Success', 'Failed', 'Cancelled', 'TimedOut'})
+_FAILED_AUTOMATION_STATUSES = frozenset({'Failed', 'TimedOut', 'Cancelled', 'CompletedWithFailure', 'Rejected'})
+_TERMINAL_AUTOMATION_STATUSES = _FAILED_AUTOMATION_STATUSES | {'Success', 'CompletedWithSuccess', 'Exited'}
+
+# Longest string kept per diagnostics field; keeps Detail well under the 256 KB PutEvents limit
+_DIAGNOSTICS_MAX_FIELD_CHARS = 8192
+_TRUNCATED_SUFFIX = '...[truncated]'
+
+# Diagnostic flag -> classification, first match wins
+_FAILURE_CLASSIFICATIONS = (
+    ('application_failure', 'Application Failure'),
+    ('disk_corruption', 'Disk Corruption'),
+    ('os_level_failure', 'OS-level Failure'),
+    ('network_degradation', 'Network Degradation'),
+    ('agent_failure', 'Agent Failure'),
+    ('resource_bottleneck', 'Resource Bottleneck'),
+)
 
 
 def lambda_handler(event: Dict[str, Any], context: Any) -> Dict[str, Any]:
@@ -26,7 +67,7 @@ def lambda_handler(event: Dict[str, Any], context: Any) -> Dict[str, Any]:
     - EventBridge event from target_monitor
     - Manual invocation
     """
-    logger.info("Diagnostics handler started", event=json.dumps(event))
+    logger.info("Diagnostics handler started", event=event)
     
     try:
         # Extract instance information from event
@@ -49,6 +90,9 @@ def lambda_handler(event: Dict[str, Any], context: Any) -> Dict[str, Any]:
         # Calculate diagnostic score
         diagnostic_score = calculate_diagnostic_score(diagnostics_result)
         
+        # Bound large command output before it is serialized for storage and EventBridge
+        diagnostics_result = _truncate_diagnostics(diagnostics_result)
+        
         # Store diagnostics result
         _store_diagnostics(
             instance_id=instance_id,
@@ -70,7 +114,7 @@ def lambda_handler(event: Dict[str, Any], context: Any) -> Dict[str, Any]:
         
         return {
             'statusCode': 200,
-            'body': json.dumps({
+            'body': dumps({
                 'instance_id': instance_id,
                 'classification': failure_classification,
                 'diagnostic_score': diagnostic_score,
@@ -86,27 +130,22 @@ def lambda_handler(event: Dict[str, Any], context: Any) -> Dict[str, Any]:
 def _extract_instance_id(event: Dict[str, Any]) -> Optional[str]:
     """Extract instance ID from event."""
     # Direct instance_id
-    if 'instance_id' in event:
-        return event['instance_id']
+    instance_id = event.get('instance_id')
+    if instance_id:
+        return instance_id
     
     # From EventBridge detail
-    if 'detail' in event:
-        detail = event['detail']
-        if isinstance(detail, str):
-            detail = json.loads(detail)
-        return detail.get('instance_id')
-    
-    return None
+    detail = event.get('detail')
+    if isinstance(detail, str):
+        detail = loads(detail)
+    return detail.get('instance_id') if isinstance(detail, dict) else None
 
 
 def _run_ssm_diagnostics(instance_id: str) -> Dict[str, Any]:
     """Run SSM command to gather diagnostics."""
-    ssm = get_ssm_client()
-    ec2 = get_ec2_client()
-    
     diagnostics = {
         'instance_id': instance_id,
-        'timestamp': datetime.utcnow().isoformat() + 'Z',
+        'timestamp': iso_now()[0],
         'ssm_available': False,
         'application_failure': False,
         'resource_bottleneck': False,
@@ -119,7 +158,7 @@ def _run_ssm_diagnostics(instance_id: str) -> Dict[str, Any]:
     
     try:
         # Check if SSM agent is available
-        response = ssm.describe_instance_information(
+        response = _SSM.describe_instance_information(
             Filters=[
                 {
                     'Key': 'InstanceIds',
@@ -138,27 +177,20 @@ def _run_ssm_diagnostics(instance_id: str) -> Dict[str, Any]:
         
         diagnostics['ssm_available'] = True
         
-        # Get instance metadata
-        instance_response = ec2.describe_instances(InstanceIds=[instance_id])
-        if instance_response.get('Reservations'):
-            instance = instance_response['Reservations'][0]['Instances'][0]
-            diagnostics['instance_state'] = instance.get('State', {}).get('Name', '')
-            diagnostics['instance_type'] = instance.get('InstanceType', '')
-        
-        # Run SSM command to gather diagnostics
-        # This would use the SSM Automation Document
-        command_id = _execute_ssm_command(instance_id)
-        
-        if command_id:
-            # Wait for command completion and get results
-            diagnostics_data = _get_ssm_command_results(instance_id, command_id)
-            diagnostics.update(diagnostics_data)
+        # The remaining checks are independent; run them concurrently and
+        # merge results in the same order they used to be applied
+        futures = [
+            _DIAGNOSTICS_POOL.submit(_get_instance_metadata, instance_id),
+            _DIAGNOSTICS_POOL.submit(_run_diagnostics_document, instance_id),
+            _DIAGNOSTICS_POOL.submit(_run_consolidated_shell, instance_id)
+        ]
+        wait(futures, timeout=DIAGNOSTICS_TIMEOUT_SECONDS)
         
-        # Run individual diagnostic checks
-        diagnostics.update(_check_service_status(instance_id))
-        diagnostics.update(_check_resource_usage(instance_id))
-        diagnostics.update(_check_network_stats(instance_id))
-        diagnostics.update(_check_logs(instance_id))
+        for future in futures:
+            if future.done():
+                diagnostics.update(future.result())
+            else:
+                logger.warning("Diagnostic check timed out", instance_id=instance_id)
     
     except Exception as e:
         logger.error("SSM diagnostics failed", instance_id=instance_id, error=str(e))
@@ -168,25 +200,55 @@ def _run_ssm_diagnostics(instance_id: str) -> Dict[str, Any]:
     return diagnostics
 
 
-def _execute_ssm_command(instance_id: str) -> Optional[str]:
-    """Execute SSM command for diagnostics."""
-    ssm = get_ssm_client()
+def _get_instance_metadata(instance_id: str) -> Dict[str, Any]:
+    """Get instance state and type from EC2."""
+    results = {}
+    
+    instance_response = _EC2.describe_instances(InstanceIds=[instance_id])
+    if instance_response.get('Reservations'):
+        instance = instance_response['Reservations'][0]['Instances'][0]
+        results['instance_state'] = instance.get('State', {}).get('Name', '')
+        results['instance_type'] = instance.get('InstanceType', '')
+    
+    return results
+
+
+def _run_diagnostics_document(instance_id: str) -> Dict[str, Any]:
+    """Run the diagnostics SSM document and collect its results."""
+    execution_id, is_automation = _execute_ssm_command(instance_id)
+    if not execution_id:
+        return {}
+    
+    # Automation executions are not Run Command invocations; track them separately
+    if is_automation:
+        return _get_automation_results(execution_id)
     
+    # Wait for command completion and get results
+    return _get_ssm_command_results(instance_id, execution_id)
+
+
+def _execute_ssm_command(instance_id: str) -> Tuple[Optional[str], bool]:
+    """
+    Execute SSM command for diagnostics.
+    
+    Returns (execution id, True) for an Automation execution, (command id,
+    False) for the Run Command fallback, or (None, False) if both failed.
+    """
     try:
         # Use SSM Automation Document
-        response = ssm.start_automation_execution(
+        response = _SSM.start_automation_execution(
             DocumentName=SSM_DIAGNOSTICS_DOCUMENT,
             Parameters={
                 'InstanceId': [instance_id]
             }
         )
-        return response.get('AutomationExecutionId')
+        return response.get('AutomationExecutionId'), True
     
     except Exception as e:
         logger.error("Failed to execute SSM command", instance_id=instance_id, error=str(e))
         # Fallback to direct command
         try:
-            response = ssm.send_command(
+            response = _SSM.send_command(
                 InstanceIds=[instance_id],
                 DocumentName='AWS-RunShellScript',
                 Parameters={
@@ -195,26 +257,69 @@ def _execute_ssm_command(instance_id: str) -> Optional[str]:
                     ]
                 }
             )
-            return response.get('Command', {}).get('CommandId')
+            return response.get('Command', {}).get('CommandId'), False
         except Exception as e2:
             logger.error("Fallback SSM command failed", error=str(e2))
-            return None
+            return None, False
+
+
+def _get_automation_results(execution_id: str) -> Dict[str, Any]:
+    """Get results from an SSM Automation execution."""
+    results = {}
+    
+    response = _wait_for_automation(execution_id, _COMMAND_MAX_WAIT_SECONDS)
+    if response is None:
+        return results
+    
+    status = response.get('AutomationExecutionStatus', '')
+    results['ssm_command_status'] = status
+    results['ssm_command_output'] = response.get('FailureMessage') or dumps(response.get('Outputs', {}))
+    
+    if status in _FAILED_AUTOMATION_STATUSES:
+        results['application_failure'] = True
+    
+    return results
+
+
+def _wait_for_automation(execution_id: str, max_wait: float) -> Optional[Dict[str, Any]]:
+    """
+    Poll get_automation_execution with exponential backoff.
+    
+    Returns the execution once it reaches a terminal status, the last
+    non-terminal execution seen if max_wait elapses, or None if it could
+    not be read at all.
+    """
+    deadline = time.monotonic() + max_wait
+    delay = _COMMAND_POLL_INITIAL_SECONDS
+    execution = None
+    
+    while True:
+        try:
+            execution = _SSM.get_automation_execution(
+                AutomationExecutionId=execution_id
+            ).get('AutomationExecution', {})
+            if execution.get('AutomationExecutionStatus') in _TERMINAL_AUTOMATION_STATUSES:
+                return execution
+        except Exception as e:
+            logger.error("Failed to get SSM automation execution", error=str(e))
+            return execution
+        
+        remaining = deadline - time.monotonic()
+        if remaining <= 0:
+            logger.warning("Timed out waiting for SSM automation", execution_id=execution_id)
+            return execution
+        time.sleep(min(delay, remaining))
+        delay = min(delay * 2, _COMMAND_POLL_MAX_SECONDS)
 
 
 def _get_ssm_command_results(instance_id: str, command_id: str) -> Dict[str, Any]:
     """Get results from SSM command execution."""
-    ssm = get_ssm_client()
     results = {}
     
     try:
-        # Wait for command to complete (simplified - would need polling)
-        import time
-        time.sleep(2)  # Placeholder
-        
-        response = ssm.get_command_invocation(
-            CommandId=command_id,
-            InstanceId=instance_id
-        )
+        response = _wait_for_command(command_id, instance_id, _COMMAND_MAX_WAIT_SECONDS)
+        if response is None:
+            return results
         
         status = response.get('Status', '')
         output = response.get('StandardOutputContent', '')
@@ -232,133 +337,151 @@ def _get_ssm_command_results(instance_id: str, command_id: str) -> Dict[str, Any
     return results
 
 
-def _check_service_status(instance_id: str) -> Dict[str, Any]:
-    """Check service status via SSM."""
-    ssm = get_ssm_client()
-    results = {}
-    
-    try:
-        # Check systemd services
-        response = ssm.send_command(
-            InstanceIds=[instance_id],
-            DocumentName='AWS-RunShellScript',
-            Parameters={
-                'commands': [
-                    'systemctl list-units --type=service --state=failed --no-pager || true',
-                    'systemctl is-active docker || echo "docker_inactive"',
-                    'systemctl is-active ecs || echo "ecs_inactive"'
-                ]
-            }
-        )
-        command_id = response.get('Command', {}).get('CommandId')
-        
-        # Simplified - would need to wait and parse
-        results['service_check_initiated'] = True
-    
-    except Exception as e:
-        logger.error("Service status check failed", error=str(e))
-        results['service_check_error'] = str(e)
-    
-    return results
+# One shell script covering service, resource, network and log checks.
+# Each section is introduced by a "###SECTION:<name>" marker line.
+_SHELL_CHECK_COMMANDS = [
+    'echo "###SECTION:services"',
+    'systemctl list-units --type=service --state=failed --no-pager --plain --no-legend || true',
+    'systemctl is-active docker || echo "docker_inactive"',
+    'systemctl is-active ecs || echo "ecs_inactive"',
+    'echo "###SECTION:cpu"',
+    'top -bn1 | grep "Cpu(s)" | awk \'{print $2}\' | cut -d\'%\' -f1',
+    'echo "###SECTION:mem"',
+    'free -m | awk \'NR==2{printf "%.2f\\n", $3*100/$2}\'',
+    'echo "###SECTION:disk"',
+    'df -h | awk \'$NF=="/"{print $5}\' | sed \'s/%//\'',
+    'echo "###SECTION:net"',
+    'netstat -i | grep -i drop || echo "no_drops"',
+    'ethtool -S eth0 | grep -i error || echo "no_errors"',
+    'echo "###SECTION:logs"',
+    'tail -n 100 /var/log/syslog | grep -i error || echo "no_errors"',
+    'journalctl -u docker --no-pager -n 50 || echo "no_docker_logs"'
+]
+_SECTION_MARKER = '###SECTION:'
 
 
-def _check_resource_usage(instance_id: str) -> Dict[str, Any]:
-    """Check CPU, memory, disk usage."""
-    ssm = get_ssm_client()
+def _run_consolidated_shell(instance_id: str) -> Dict[str, Any]:
+    """Run service, resource, network and log checks in one SSM command."""
     results = {}
     
     try:
-        response = ssm.send_command(
+        response = _SSM.send_command(
             InstanceIds=[instance_id],
             DocumentName='AWS-RunShellScript',
-            Parameters={
-                'commands': [
-                    'top -bn1 | grep "Cpu(s)" | awk \'{print $2}\' | cut -d\'%\' -f1',
-                    'free -m | awk \'NR==2{printf "%.2f", $3*100/$2}\'',
-                    'df -h | awk \'$NF=="/"{print $5}\' | sed \'s/%//\''
-                ]
-            }
+            Parameters={'commands': _SHELL_CHECK_COMMANDS}
         )
         command_id = response.get('Command', {}).get('CommandId')
+        results['service_check_initiated'] = True
         results['resource_check_initiated'] = True
+        results['network_check_initiated'] = True
+        results['log_check_initiated'] = True
     
     except Exception as e:
-        logger.error("Resource usage check failed", error=str(e))
-        results['resource_check_error'] = str(e)
+        logger.error("Shell checks failed", error=str(e))
+        results['shell_check_error'] = str(e)
+        return results
+    
+    invocation = _wait_for_command(command_id, instance_id, _COMMAND_MAX_WAIT_SECONDS)
+    if invocation is None:
+        results['shell_check_status'] = 'Pending'
+        return results
+    
+    results['shell_check_status'] = invocation.get('Status', '')
+    results.update(_parse_shell_sections(invocation.get('StandardOutputContent', '')))
     
     return results
 
 
-def _check_network_stats(instance_id: str) -> Dict[str, Any]:
-    """Check network statistics."""
-    ssm = get_ssm_client()
-    results = {}
-    
-    try:
-        response = ssm.send_command(
-            InstanceIds=[instance_id],
-            DocumentName='AWS-RunShellScript',
-            Parameters={
-                'commands': [
-                    'netstat -i | grep -i drop || echo "no_drops"',
-                    'ethtool -S eth0 | grep -i error || echo "no_errors"'
-                ]
-            }
-        )
-        command_id = response.get('Command', {}).get('CommandId')
-        results['network_check_initiated'] = True
+def _wait_for_command(command_id: str, instance_id: str, max_wait: float) -> Optional[Dict[str, Any]]:
+    """
+    Poll get_command_invocation with exponential backoff.
     
-    except Exception as e:
-        logger.error("Network stats check failed", error=str(e))
-        results['network_check_error'] = str(e)
+    Returns the invocation once it reaches a terminal status, the last
+    non-terminal invocation seen if max_wait elapses, or None if the
+    invocation could not be read at all.
+    """
+    deadline = time.monotonic() + max_wait
+    delay = _COMMAND_POLL_INITIAL_SECONDS
+    response = None
     
-    return results
+    while True:
+        try:
+            response = _SSM.get_command_invocation(
+                CommandId=command_id,
+                InstanceId=instance_id
+            )
+            if response.get('Status') in _TERMINAL_COMMAND_STATUSES:
+                return response
+        except _SSM.exceptions.InvocationDoesNotExist:
+            # The invocation is not visible immediately after send_command
+            pass
+        except Exception as e:
+            logger.error("Failed to get SSM command invocation", error=str(e))
+            return response
+        
+        remaining = deadline - time.monotonic()
+        if remaining <= 0:
+            logger.warning("Timed out waiting for SSM command", command_id=command_id)
+            return response
+        time.sleep(min(delay, remaining))
+        delay = min(delay * 2, _COMMAND_POLL_MAX_SECONDS)
 
 
-def _check_logs(instance_id: str) -> Dict[str, Any]:
-    """Check application and system logs."""
-    ssm = get_ssm_client()
-    results = {}
+def _parse_shell_sections(output: str) -> Dict[str, Any]:
+    """Parse sectioned shell check output into diagnostic fields."""
+    sections: Dict[str, List[str]] = {}
+    current = None
+    for line in output.splitlines():
+        if line.startswith(_SECTION_MARKER):
+            current = line[len(_SECTION_MARKER):].strip()
+            sections[current] = []
+        elif current is not None and line.strip():
+            sections[current].append(line.strip())
     
-    try:
-        response = ssm.send_command(
-            InstanceIds=[instance_id],
-            DocumentName='AWS-RunShellScript',
-            Parameters={
-                'commands': [
-                    'tail -n 100 /var/log/syslog | grep -i error || echo "no_errors"',
-                    'journalctl -u docker --no-pager -n 50 || echo "no_docker_logs"'
-                ]
-            }
-        )
-        command_id = response.get('Command', {}).get('CommandId')
-        results['log_check_initiated'] = True
+    results = {}
+    for key, section in (('cpu_usage', 'cpu'), ('memory_usage', 'mem'), ('disk_usage', 'disk')):
+        try:
+            results[key] = float(sections[section][0])
+        except (KeyError, IndexError, ValueError):
+            pass
     
-    except Exception as e:
-        logger.error("Log check failed", error=str(e))
-        results['log_check_error'] = str(e)
+    results['failed_services'] = [
+        line.split()[0] for line in sections.get('services', [])
+        if '.service' in line
+    ]
+    results['inactive_services'] = [
+        line[:-len('_inactive')] for line in sections.get('services', [])
+        if line.endswith('_inactive')
+    ]
+    results['network_errors'] = [
+        line for line in sections.get('net', [])
+        if line not in ('no_drops', 'no_errors')
+    ]
+    results['log_errors'] = len([
+        line for line in sections.get('logs', [])
+        if 'error' in line.lower()
+    ])
     
     return results
 
 
 def _classify_failure(diagnostics: Dict[str, Any]) -> str:
     """Classify failure type based on diagnostics."""
-    if diagnostics.get('application_failure'):
-        return 'Application Failure'
-    elif diagnostics.get('disk_corruption'):
-        return 'Disk Corruption'
-    elif diagnostics.get('os_level_failure'):
-        return 'OS-level Failure'
-    elif diagnostics.get('network_degradation'):
-        return 'Network Degradation'
-    elif diagnostics.get('agent_failure'):
-        return 'Agent Failure'
-    elif diagnostics.get('resource_bottleneck'):
-        return 'Resource Bottleneck'
-    elif diagnostics.get('unknown_state'):
-        return 'Unknown State'
-    else:
-        return 'Unknown State'
+    return next(
+        (label for key, label in _FAILURE_CLASSIFICATIONS if diagnostics.get(key)),
+        'Unknown State'
+    )
+
+
+def _truncate_diagnostics(value: Any, max_field: int = _DIAGNOSTICS_MAX_FIELD_CHARS) -> Any:
+    """Cap every string in the diagnostics tree at max_field characters."""
+    if isinstance(value, str):
+        return value[:max_field] + _TRUNCATED_SUFFIX if len(value) > max_field else value
+    if isinstance(value, dict):
+        return {k: _truncate_diagnostics(v, max_field) for k, v in value.items()}
+    if isinstance(value, list):
+        return [_truncate_diagnostics(v, max_field) for v in value]
+    return value
 
 
 def _store_diagnostics(
@@ -370,24 +493,23 @@ def _store_diagnostics(
     issue_type: str
 ):
     """Store diagnostics result in DynamoDB."""
-    dynamodb = get_dynamodb_resource()
-    table = dynamodb.Table(DIAGNOSTICS_TABLE)
+    now_iso, now_epoch = iso_now()
     
     try:
-        # Convert float to Decimal for DynamoDB compatibility
-        from decimal import Decimal
-        
-        table.put_item(
+        # Built directly in DynamoDB's typed format for the low-level client
+        _DDB_CLIENT.put_item(
+            TableName=DIAGNOSTICS_TABLE,
             Item={
-                'DiagnosticId': f"{instance_id}#{datetime.utcnow().isoformat()}",
-                'InstanceId': instance_id,
-                'TargetGroupArn': target_group_arn,
-                'Classification': classification,
-                'DiagnosticScore': Decimal(str(round(score, 2))),
-                'Diagnostics': diagnostics,
-                'IssueType': issue_type,
-                'Timestamp': datetime.utcnow().isoformat() + 'Z',
-                'TTL': int((datetime.utcnow() + timedelta(days=90)).timestamp())
+                'DiagnosticId': {'S': f"{instance_id}#{now_iso[:-1]}"},
+                'InstanceId': {'S': instance_id},
+                'TargetGroupArn': {'S': target_group_arn},
+                'Classification': {'S': classification},
+                'DiagnosticScore': {'N': str(round(score, 2))},
+                # Stored as one gzip-compressed JSON Binary attribute instead of a nested map
+                'DiagnosticsBlob': {'B': gzip.compress(dumps(diagnostics).encode('utf-8'), compresslevel=6)},
+                'IssueType': {'S': issue_type},
+                'Timestamp': {'S': now_iso},
+                'TTL': {'N': str(now_epoch + _DIAGNOSTICS_TTL_SECONDS)}
             }
         )
         logger.info("Diagnostics stored", instance_id=instance_id)
@@ -403,27 +525,28 @@ def _trigger_auto_heal(
     score: float
 ):
     """Trigger auto-heal process via EventBridge."""
-    import boto3
-    eventbridge = boto3.client('events')
+    entries = [{
+        'Source': 'auto-heal.diagnostics',
+        'DetailType': 'Diagnostics Complete',
+        'Detail': dumps({
+            'instance_id': instance_id,
+            'target_group_arn': target_group_arn,
+            'classification': classification,
+            'diagnostic_score': score,
+            'diagnostics': diagnostics
+        }),
+        'EventBusName': EVENT_BUS_NAME
+    }]
     
     try:
-        eventbridge.put_events(
-            Entries=[
-                {
-                    'Source': 'auto-heal.diagnostics',
-                    'DetailType': 'Diagnostics Complete',
-                    'Detail': json.dumps({
-                        'instance_id': instance_id,
-                        'target_group_arn': target_group_arn,
-                        'classification': classification,
-                        'diagnostic_score': score,
-                        'diagnostics': diagnostics
-                    }),
-                    'EventBusName': os.environ.get('EVENT_BUS_NAME', 'default')
-                }
-            ]
-        )
-        logger.info("Auto-heal triggered", instance_id=instance_id)
+        for attempt in range(_PUT_EVENTS_MAX_ATTEMPTS):
+            if attempt:
+                time.sleep(0.1 * (2 ** attempt))
+            response = _EVENTS.put_events(Entries=entries)
+            if not response.get('FailedEntryCount'):
+                logger.info("Auto-heal triggered", instance_id=instance_id)
+                return
+        logger.error("Failed to trigger auto-heal", instance_id=instance_id,
+                     error_code=response['Entries'][0].get('ErrorCode'))
     except Exception as e:
         logger.error("Failed to trigger auto-heal", error=str(e))
-
@@ -1,12 +1,24 @@
 """Slack notification Lambda handler - sends SNS messages to Slack."""
 import json
 import os
-import urllib.request
-import urllib.error
+import re
+import time
 import logging
 from typing import Dict, Any
 from datetime import datetime
 
+import urllib3
+
+try:
+    import orjson
+except ImportError:  # orjson is optional; fall back to the stdlib
+    orjson = None
+
+try:
+    import ciso8601
+except ImportError:  # ciso8601 is optional; fall back to datetime.fromisoformat
+    ciso8601 = None
+
 # Configure logger
 logger = logging.getLogger()
 logger.setLevel(logging.INFO)
@@ -15,6 +27,64 @@ SLACK_WEBHOOK_URL = os.environ.get('SLACK_WEBHOOK_URL', '')
 SLACK_CHANNEL = os.environ.get('SLACK_CHANNEL', '#general')
 SLACK_USERNAME = os.environ.get('SLACK_USERNAME', 'Auto-Heal Bot')
 
+# Pooled HTTPS connection to the webhook, kept alive across warm invocations
+_HTTP = urllib3.PoolManager(
+    num_pools=1,
+    maxsize=4,
+    retries=urllib3.Retry(total=2, backoff_factor=0.2)
+)
+
+
+def _json_loads(data: str) -> Any:
+    """Deserialize JSON (orjson when available)."""
+    if orjson is not None:
+        return orjson.loads(data)
+    return json.loads(data)
+
+
+def _json_dumps_bytes(obj: Any) -> bytes:
+    """Serialize object to UTF-8 JSON bytes (orjson when available)."""
+    if orjson is not None:
+        return orjson.dumps(obj)
+    return json.dumps(obj).encode('utf-8')
+
+
+# Lookup tables built once per container instead of on every message
+_EMOJI_MAP = {
+    'unhealthy_target': '🚨',
+    'degraded_target': '⚠️',
+    'flapping_target': '🔄',
+    'diagnostics_complete': '🔍',
+    'auto_heal_complete': '✅',
+    'verification_complete': '✓',
+    'verification_failed': '❌'
+}
+_COLOR_MAP = {
+    'target_health_issue': 'warning',
+    'unhealthy_target': 'danger',  # Red
+    'degraded_target': 'warning',  # Yellow
+    'flapping_target': 'warning',  # Yellow
+    'diagnostics_complete': '#36a64f',  # Green
+    'auto_heal_complete': '#36a64f',  # Green
+    'verification_complete': '#36a64f',  # Green
+    'verification_failed': 'danger',  # Red
+    'system_ready': '#36a64f',  # Green
+    'test': '#439FE0'  # Blue
+}
+
+# Patterns compiled once per container instead of on every SNS record
+_NUMBER_RE = re.compile(r'-?[0-9]+(\.[0-9]+)?')
+_BARE_LITERALS = {'true': 'true', 'false': 'false', 'null': 'null', 'none': 'null'}
+# Remove emoji characters (Unicode ranges for emojis)
+_EMOJI_RE = re.compile("["
+    u"\U0001F600-\U0001F64F"  # emoticons
+    u"\U0001F300-\U0001F5FF"  # symbols & pictographs
+    u"\U0001F680-\U0001F6FF"  # transport & map symbols
+    u"\U0001F1E0-\U0001F1FF"  # flags (iOS)
+    u"\U00002702-\U000027B0"
+    u"\U000024C2-\U0001F251"
+    "]+", flags=re.UNICODE)
+
 
 def lambda_handler(event: Dict[str, Any], context: Any) -> Dict[str, Any]:
     """
@@ -22,7 +92,8 @@ def lambda_handler(event: Dict[str, Any], context: Any) -> Dict[str, Any]:
     
     Triggered by SNS topic subscription.
     """
-    logger.info(f"Slack notifier started: {json.dumps(event)}")
+    if logger.isEnabledFor(logging.INFO):
+        logger.info(f"Slack notifier started: {json.dumps(event)}")
     
     if not SLACK_WEBHOOK_URL:
         logger.error("SLACK_WEBHOOK_URL not configured")
@@ -41,31 +112,19 @@ def lambda_handler(event: Dict[str, Any], context: Any) -> Dict[str, Any]:
             # Parse message if it's JSON
             message_data = None
             try:
-                message_data = json.loads(message)
+                message_data = _json_loads(message)
             except (json.JSONDecodeError, TypeError):
-                # Try to parse malformed JSON (keys without quotes)
+                # Try to parse malformed JSON (keys/values without quotes)
                 try:
-                    # Replace unquoted keys with quoted keys
-                    import re
-                    # Pattern: word followed by colon (but not already quoted)
-                    fixed_message = re.sub(r'([{,]\s*)([a-zA-Z_][a-zA-Z0-9_]*)\s*:', r'\1"\2":', message)
-                    # Fix string values that aren't quoted
-                    fixed_message = re.sub(r':\s*([a-zA-Z0-9_/-]+)([,}])', r': "\1"\2', fixed_message)
-                    # Fix boolean and numeric values
-                    fixed_message = re.sub(r':\s*(true|false|null)([,}])', r': \1\2', fixed_message)
-                    fixed_message = re.sub(r':\s*([0-9]+\.?[0-9]*)([,}])', r': \1\2', fixed_message)
-                    message_data = json.loads(fixed_message)
+                    message_data = _json_loads(_repair_pseudo_json(message))
                     logger.info(f"Successfully parsed malformed JSON")
                 except Exception as e:
                     logger.warning(f"Could not parse message as JSON: {str(e)}")
                     # Try to parse as dict if it's already a dict
                     if isinstance(message, dict):
                         message_data = message
-                    else:
-                        # Last resort: try to extract key-value pairs manually
-                        message_data = _parse_pseudo_json(message)
             
-            if message_data:
+            if isinstance(message_data, dict) and message_data:
                 formatted_message = _format_message(message_data, subject)
             else:
                 formatted_message = _format_simple_message(message, subject)
@@ -93,16 +152,7 @@ def _format_message(message_data: Dict[str, Any], subject: str) -> Dict[str, Any
     color = _get_color_for_event(event_type)
     
     # Build main text with emoji based on event type
-    emoji_map = {
-        'unhealthy_target': '🚨',
-        'degraded_target': '⚠️',
-        'flapping_target': '🔄',
-        'diagnostics_complete': '🔍',
-        'auto_heal_complete': '✅',
-        'verification_complete': '✓',
-        'verification_failed': '❌'
-    }
-    emoji = emoji_map.get(event_type, '📢')
+    emoji = _EMOJI_MAP.get(event_type, '📢')
     
     fields = []
     
@@ -114,7 +164,7 @@ def _format_message(message_data: Dict[str, Any], subject: str) -> Dict[str, Any
         })
     
     if target_group_arn != 'Unknown':
-        tg_name = target_group_arn.split('/')[-1] if '/' in target_group_arn else target_group_arn
+        tg_name = target_group_arn.rsplit('/', 1)[-1]
         fields.append({
             "title": "🎯 Target Group",
             "value": f"`{tg_name}`",
@@ -155,18 +205,12 @@ def _format_message(message_data: Dict[str, Any], subject: str) -> Dict[str, Any
     
     # Add custom message if provided
     if message_text:
-        # Clean emojis from message text to avoid encoding issues
-        import re
-        # Remove emoji characters (Unicode ranges for emojis)
-        emoji_pattern = re.compile("["
-            u"\U0001F600-\U0001F64F"  # emoticons
-            u"\U0001F300-\U0001F5FF"  # symbols & pictographs
-            u"\U0001F680-\U0001F6FF"  # transport & map symbols
-            u"\U0001F1E0-\U0001F1FF"  # flags (iOS)
-            u"\U00002702-\U000027B0"
-            u"\U000024C2-\U0001F251"
-            "]+", flags=re.UNICODE)
-        clean_message = emoji_pattern.sub('', message_text).strip()
+        # Clean emojis from message text to avoid encoding issues;
+        # pure-ASCII text cannot contain any, so it skips the regex
+        if message_text.isascii():
+            clean_message = message_text.strip()
+        else:
+            clean_message = _EMOJI_RE.sub('', message_text).strip()
         # Add back a simple prefix if message had emoji
         if clean_message != message_text:
             clean_message = "• " + clean_message
@@ -193,31 +237,65 @@ def _format_message(message_data: Dict[str, Any], subject: str) -> Dict[str, Any
     }
 
 
-def _parse_pseudo_json(message: str) -> Dict[str, Any]:
-    """Parse pseudo-JSON format (keys without quotes) into a dict."""
-    result = {}
-    try:
-        # Remove outer braces
-        content = message.strip().strip('{}')
-        # Split by comma, but be careful with nested structures
-        import re
-        # Match key:value pairs
-        pattern = r'([a-zA-Z_][a-zA-Z0-9_]*)\s*:\s*([^,}]+?)(?=,\s*[a-zA-Z_]|$)'
-        matches = re.findall(pattern, content)
-        for key, value in matches:
-            value = value.strip().strip('"\'')
-            # Try to convert to appropriate type
-            if value.lower() == 'true':
-                result[key] = True
-            elif value.lower() == 'false':
-                result[key] = False
-            elif value.replace('.', '', 1).isdigit():
-                result[key] = float(value) if '.' in value else int(value)
+def _repair_pseudo_json(message: str) -> str:
+    """
+    Rewrite pseudo-JSON (unquoted keys and values) as valid JSON in one pass.
+    
+    Quoted strings are copied through untouched. Bare keys are quoted, and
+    bare values become true/false/null, numbers or quoted strings.
+    """
+    out = []
+    containers = []  # stack of open '{' / '['
+    expecting_key = False
+    i = 0
+    n = len(message)
+    
+    while i < n:
+        char = message[i]
+        
+        if char == '"':
+            # Copy quoted string including escapes
+            j = i + 1
+            while j < n and message[j] != '"':
+                j += 2 if message[j] == '\\' else 1
+            out.append(message[i:j + 1])
+            i = j + 1
+            expecting_key = False
+            continue
+        
+        if char in '{[':
+            containers.append(char)
+            expecting_key = char == '{'
+        elif char in '}]':
+            if containers:
+                containers.pop()
+            expecting_key = False
+        elif char == ',':
+            expecting_key = bool(containers) and containers[-1] == '{'
+        elif char == ':':
+            expecting_key = False
+        elif not char.isspace():
+            # Bare token: keys end at ':', values at the next delimiter
+            stops = ':' if expecting_key else ',}]'
+            j = i
+            while j < n and message[j] not in stops:
+                j += 1
+            token = message[i:j].strip().strip('\'')
+            if expecting_key:
+                out.append(json.dumps(token))
+            elif token.lower() in _BARE_LITERALS:
+                out.append(_BARE_LITERALS[token.lower()])
+            elif _NUMBER_RE.fullmatch(token):
+                out.append(token)
             else:
-                result[key] = value
-    except Exception as e:
-        logger.warning(f"Failed to parse pseudo-JSON: {str(e)}")
-    return result
+                out.append(json.dumps(token))
+            i = j
+            continue
+        
+        out.append(char)
+        i += 1
+    
+    return ''.join(out)
 
 
 def _format_simple_message(message: str, subject: str) -> Dict[str, Any]:
@@ -231,53 +309,40 @@ def _format_simple_message(message: str, subject: str) -> Dict[str, Any]:
 
 def _get_color_for_event(event_type: str) -> str:
     """Get color for Slack message based on event type."""
-    color_map = {
-        'target_health_issue': 'warning',
-        'unhealthy_target': 'danger',  # Red
-        'degraded_target': 'warning',  # Yellow
-        'flapping_target': 'warning',  # Yellow
-        'diagnostics_complete': '#36a64f',  # Green
-        'auto_heal_complete': '#36a64f',  # Green
-        'verification_complete': '#36a64f',  # Green
-        'verification_failed': 'danger',  # Red
-        'system_ready': '#36a64f',  # Green
-        'test': '#439FE0'  # Blue
-    }
-    return color_map.get(event_type, '#36a64f')
+    return _COLOR_MAP.get(event_type, '#36a64f')
 
 
 def _get_timestamp(timestamp: str) -> int:
     """Convert ISO timestamp to Unix timestamp."""
+    if not timestamp:
+        return int(time.time())
     try:
-        from datetime import datetime
-        dt = datetime.fromisoformat(timestamp.replace('Z', '+00:00'))
-        return int(dt.timestamp())
-    except:
-        import time
+        if ciso8601 is not None:
+            return int(ciso8601.parse_datetime(timestamp).timestamp())
+        # Python 3.11+ parses a trailing 'Z' natively
+        return int(datetime.fromisoformat(timestamp).timestamp())
+    except (ValueError, TypeError):
         return int(time.time())
 
 
 def _send_to_slack(message: Dict[str, Any], subject: str):
     """Send message to Slack via webhook."""
     try:
-        payload = json.dumps(message).encode('utf-8')
-        
-        req = urllib.request.Request(
+        response = _HTTP.request(
+            'POST',
             SLACK_WEBHOOK_URL,
-            data=payload,
-            headers={'Content-Type': 'application/json'}
+            body=_json_dumps_bytes(message),
+            headers={'Content-Type': 'application/json'},
+            timeout=10.0
         )
-        
-        with urllib.request.urlopen(req, timeout=10) as response:
-            response_text = response.read().decode('utf-8')
-            logger.info(f"Message sent to Slack - Subject: {subject}, Response: {response_text}")
-    
-    except urllib.error.HTTPError as e:
-        error_body = e.read().decode('utf-8')
-        logger.error(f"Slack webhook HTTP error - Status: {e.code}, Error: {error_body}")
-        raise
-    
     except Exception as e:
         logger.error(f"Failed to send message to Slack: {str(e)}")
         raise
-
+    
+    response_text = response.data.decode('utf-8')
+    
+    if response.status >= 400:
+        logger.error(f"Slack webhook HTTP error - Status: {response.status}, Error: {response_text}")
+        raise RuntimeError(f"Slack webhook returned HTTP {response.status}")
+    
+    logger.info(f"Message sent to Slack - Subject: {subject}, Response: {response_text}")
@@ -1,18 +1,24 @@
 """Target health monitoring Lambda handler."""
-import json
 import os
-from typing import Dict, Any, List
+import time
+from collections import deque
+from concurrent.futures import ThreadPoolExecutor
+from typing import Deque, Dict, Any, List, Optional, Set, Tuple
 from datetime import datetime, timedelta
 from utils.aws_clients import (
     get_elbv2_client,
     get_cloudwatch_client,
-    get_dynamodb_resource
+    get_dynamodb_resource,
+    get_dax_resource,
+    get_events_client
 )
 from utils.logger import get_logger
+from utils.serialization import dumps
 from utils.helpers import (
     get_target_health_metrics,
     check_flapping,
-    parse_target_arn
+    parse_target_arn,
+    iso_now
 )
 
 logger = get_logger(__name__)
@@ -21,6 +27,50 @@ logger = get_logger(__name__)
 TARGET_HEALTH_TABLE = os.environ.get('TARGET_HEALTH_TABLE', 'TargetHealthEvents')
 DIAGNOSTICS_TABLE = os.environ.get('DIAGNOSTICS_TABLE', 'DiagnosticsHistory')
 EVENT_BUS_NAME = os.environ.get('EVENT_BUS_NAME', 'default')
+METRICS_NAMESPACE = os.environ.get('METRICS_NAMESPACE', 'AutoHeal')
+# Set to 0 to return only the issue count and keep the response body small
+INCLUDE_ISSUES_IN_RESPONSE = os.environ.get('INCLUDE_ISSUES_IN_RESPONSE', '1') == '1'
+
+# AWS clients are created once per container, before any worker thread
+# starts, and reused across warm invocations
+_ELBV2 = get_elbv2_client()
+_CW = get_cloudwatch_client()
+_EVENTS = get_events_client()
+_HEALTH_TBL = get_dynamodb_resource().Table(TARGET_HEALTH_TABLE)
+# Reads go through DAX when DAX_ENDPOINT is configured; writes stay on DynamoDB
+_READ_DDB = get_dax_resource()
+_HEALTH_READ_TBL = _READ_DDB.Table(TARGET_HEALTH_TABLE)
+
+# Target groups are monitored concurrently; each one is IO-bound AWS calls
+_MONITOR_POOL = ThreadPoolExecutor(max_workers=16)
+# Separate pool for each group's CloudWatch fetch, so monitor workers never
+# wait on tasks queued behind themselves
+_METRICS_POOL = ThreadPoolExecutor(max_workers=16)
+
+_HEALTH_EVENT_TTL_SECONDS = 30 * 24 * 3600
+
+# Target health state -> issue type; 'unused' and degraded reasons are handled as overrides
+_STATE_TO_ISSUE = {
+    'unhealthy': 'unhealthy_target',
+    'draining': 'degraded_target'
+}
+
+# Each target also has a fixed-key row holding its latest recorded state,
+# so a cold container can load a whole group with BatchGetItem
+_LATEST_EVENT_SUFFIX = '#latest'
+_BATCH_GET_MAX_KEYS = 100
+_BATCH_GET_MAX_ATTEMPTS = 5
+
+# PutEvents accepts at most 10 entries per call
+_PUT_EVENTS_MAX_ENTRIES = 10
+
+# Recent health states per (target group, instance), oldest first. Kept in
+# container memory so warm invocations detect flapping without a GSI query.
+# Targets missing from a group's latest describe are pruned; the size cap also
+# covers target groups that stop being monitored (oldest entries go first)
+_FLAP_HISTORY_SIZE = 10
+_FLAP_CACHE_MAX_ENTRIES = 10000
+_FLAP_CACHE: Dict[Tuple[str, str], Deque[str]] = {}
 
 
 def lambda_handler(event: Dict[str, Any], context: Any) -> Dict[str, Any]:
@@ -42,25 +92,37 @@ def lambda_handler(event: Dict[str, Any], context: Any) -> Dict[str, Any]:
             logger.warning("No target groups specified")
             return {'statusCode': 200, 'body': 'No target groups to monitor'}
         
-        issues_detected = []
+        # map() keeps results in target group order
+        issues_detected = [
+            issue
+            for issues in _MONITOR_POOL.map(_monitor_target_group, target_groups)
+            for issue in issues
+        ]
         
-        for tg_arn in target_groups:
-            logger.info("Monitoring target group", target_group_arn=tg_arn)
-            issues = _monitor_target_group(tg_arn)
-            issues_detected.extend(issues)
+        # Pool work is done, so the cache can be trimmed without racing it
+        _trim_flap_cache()
         
         # Send events for detected issues
-        for issue in issues_detected:
-            _send_issue_event(issue)
+        _send_issue_events(issues_detected)
         
-        logger.info("Target monitor completed", issues_detected=len(issues_detected))
+        # One EMF line carries the run's metrics instead of per-group info logs
+        logger.metric(
+            "Target monitor completed",
+            METRICS_NAMESPACE,
+            {
+                'TargetGroupsMonitored': (len(target_groups), 'Count'),
+                'IssuesDetected': (len(issues_detected), 'Count')
+            },
+            issues_detected=len(issues_detected)
+        )
+        
+        body = {'issues_detected': len(issues_detected)}
+        if INCLUDE_ISSUES_IN_RESPONSE:
+            body['issues'] = issues_detected
         
         return {
             'statusCode': 200,
-            'body': json.dumps({
-                'issues_detected': len(issues_detected),
-                'issues': issues_detected
-            })
+            'body': dumps(body)
         }
     
     except Exception as e:
@@ -95,18 +157,32 @@ def _get_target_groups(event: Dict[str, Any]) -> List[str]:
 
 def _monitor_target_group(target_group_arn: str) -> List[Dict[str, Any]]:
     """Monitor a single target group for health issues."""
-    elbv2 = get_elbv2_client()
+    logger.debug("Monitoring target group", target_group_arn=target_group_arn)
+    tg_name = target_group_arn.rsplit('/', 1)[-1]
     issues = []
     
+    # The CloudWatch query doesn't depend on target health, so it runs
+    # alongside the describe call and the per-target loop
+    metrics_future = _METRICS_POOL.submit(_get_max_unhealthy_hosts, tg_name)
+    
     try:
         # Get target health descriptions
-        response = elbv2.describe_target_health(TargetGroupArn=target_group_arn)
+        response = _ELBV2.describe_target_health(TargetGroupArn=target_group_arn)
         targets = response.get('TargetHealthDescriptions', [])
         
-        logger.info("Targets in group", 
+        logger.debug("Targets in group",
                    target_group=target_group_arn,
                    total_targets=len(targets))
         
+        health_events = []
+        # One clock reading shared by every record and issue from this group
+        now_iso, now_epoch = iso_now()
+        
+        # Cold container: seed state history for the whole group in one pass
+        _seed_state_history(target_group_arn, [
+            target.get('Target', {}).get('Id') for target in targets
+        ])
+        
         for target in targets:
             target_info = target.get('Target', {})
             health = target.get('TargetHealth', {})
@@ -115,60 +191,58 @@ def _monitor_target_group(target_group_arn: str) -> List[Dict[str, Any]]:
             reason = health.get('Reason', '')
             description = health.get('Description', '')
             
-            # Record health state change
-            _record_health_event(target_group_arn, instance_id, state, reason, description)
+            # Updates the in-memory state history, so it runs before the change check
+            flapping = _check_target_flapping(target_group_arn, instance_id, state)
             
-            # Check for issues
-            if state == 'unhealthy':
-                issue = {
-                    'target_group_arn': target_group_arn,
-                    'instance_id': instance_id,
-                    'state': state,
-                    'reason': reason,
-                    'description': description,
-                    'timestamp': datetime.utcnow().isoformat() + 'Z',
-                    'issue_type': 'unhealthy_target'
-                }
-                issues.append(issue)
+            # Candidate state change, confirmed against the #latest row when
+            # recorded after the loop; in-memory repeats are skipped up front
+            if _state_changed(target_group_arn, instance_id):
+                health_events.append(
+                    _build_health_event(target_group_arn, instance_id, state, reason, description,
+                                        now_iso, now_epoch)
+                )
             
-            # Check for unused state (target not in use due to AZ/subnet issues)
-            elif state == 'unused' and 'NotInUse' in reason:
-                issue = {
-                    'target_group_arn': target_group_arn,
-                    'instance_id': instance_id,
-                    'state': state,
-                    'reason': reason,
-                    'description': description,
-                    'timestamp': datetime.utcnow().isoformat() + 'Z',
-                    'issue_type': 'unused_target'
-                }
-                issues.append(issue)
+            # Check for issues: state lookup first, then the reason-based overrides
+            issue_type = _STATE_TO_ISSUE.get(state)
+            if state == 'unused' and 'NotInUse' in reason:
+                # Target not in use due to AZ/subnet issues
+                issue_type = 'unused_target'
+            elif issue_type is None and 'degraded' in reason.lower():
+                issue_type = 'degraded_target'
             
-            # Check for degraded state
-            elif state == 'draining' or 'degraded' in reason.lower():
+            if issue_type is not None:
                 issue = {
                     'target_group_arn': target_group_arn,
                     'instance_id': instance_id,
                     'state': state,
-                    'reason': reason,
-                    'timestamp': datetime.utcnow().isoformat() + 'Z',
-                    'issue_type': 'degraded_target'
+                    'reason': reason
                 }
+                if issue_type != 'degraded_target':
+                    issue['description'] = description
+                issue['timestamp'] = now_iso
+                issue['issue_type'] = issue_type
                 issues.append(issue)
             
             # Check for flapping
-            if _check_target_flapping(target_group_arn, instance_id):
+            if flapping:
                 issue = {
                     'target_group_arn': target_group_arn,
                     'instance_id': instance_id,
                     'state': state,
-                    'timestamp': datetime.utcnow().isoformat() + 'Z',
+                    'timestamp': now_iso,
                     'issue_type': 'flapping_target'
                 }
                 issues.append(issue)
         
+        _record_health_events(health_events)
+        _prune_state_history(target_group_arn, {
+            target.get('Target', {}).get('Id') for target in targets
+        })
+        
         # Check aggregate metrics
-        aggregate_issues = _check_aggregate_metrics(target_group_arn, targets)
+        aggregate_issues = _check_aggregate_metrics(
+            target_group_arn, metrics_future.result(), targets, now_iso
+        )
         issues.extend(aggregate_issues)
     
     except Exception as e:
@@ -179,42 +253,159 @@ def _monitor_target_group(target_group_arn: str) -> List[Dict[str, Any]]:
     return issues
 
 
-def _record_health_event(
+def _build_health_event(
     target_group_arn: str,
     instance_id: str,
     state: str,
     reason: str,
-    description: str
-):
-    """Record target health event to DynamoDB."""
-    dynamodb = get_dynamodb_resource()
-    table = dynamodb.Table(TARGET_HEALTH_TABLE)
+    description: str,
+    now_iso: str,
+    now_epoch: int
+) -> Dict[str, Any]:
+    """Build target health event item for DynamoDB."""
+    return {
+        # Nanosecond suffix: cheaper than an ISO string and unique per event
+        'EventId': f"{target_group_arn}#{instance_id}#{time.time_ns()}",
+        'TargetGroupArn': target_group_arn,
+        'InstanceId': instance_id,
+        'State': state,
+        'Reason': reason,
+        'Description': description,
+        'Timestamp': now_iso,
+        'TTL': now_epoch + _HEALTH_EVENT_TTL_SECONDS
+    }
+
+
+def _record_health_events(health_events: List[Dict[str, Any]]):
+    """Record confirmed target health state changes to DynamoDB."""
+    if not health_events:
+        return
     
     try:
-        table.put_item(
-            Item={
-                'EventId': f"{target_group_arn}#{instance_id}#{datetime.utcnow().isoformat()}",
-                'TargetGroupArn': target_group_arn,
-                'InstanceId': instance_id,
-                'State': state,
-                'Reason': reason,
-                'Description': description,
-                'Timestamp': datetime.utcnow().isoformat() + 'Z',
-                'TTL': int((datetime.utcnow() + timedelta(days=30)).timestamp())
-            }
-        )
+        # The #latest row is the source of truth for the current state; only
+        # events whose conditional put succeeds are real transitions
+        changed = [event for event in health_events if _update_latest_state(event)]
+        if not changed:
+            return
+        
+        # batch_writer groups puts into BatchWriteItem calls of up to 25
+        # items and resends any UnprocessedItems
+        with _HEALTH_TBL.batch_writer(overwrite_by_pkeys=['EventId']) as batch:
+            for item in changed:
+                batch.put_item(Item=item)
     except Exception as e:
         logger.error("Failed to record health event", error=str(e))
 
 
-def _check_target_flapping(target_group_arn: str, instance_id: str) -> bool:
+def _update_latest_state(event: Dict[str, Any]) -> bool:
+    """Write a target's #latest row if its state changed; False if unchanged."""
+    try:
+        _HEALTH_TBL.put_item(
+            # No InstanceId/Timestamp, so it stays out of the history GSI
+            Item={
+                'EventId': f"{event['TargetGroupArn']}#{event['InstanceId']}{_LATEST_EVENT_SUFFIX}",
+                'State': event['State'],
+                'TTL': event['TTL']
+            },
+            ConditionExpression='attribute_not_exists(EventId) OR #s <> :s',
+            ExpressionAttributeNames={'#s': 'State'},
+            ExpressionAttributeValues={':s': event['State']}
+        )
+        return True
+    except _HEALTH_TBL.meta.client.exceptions.ConditionalCheckFailedException:
+        # Another container (or an earlier run) already recorded this state
+        return False
+
+
+def _check_target_flapping(target_group_arn: str, instance_id: str, state: str) -> bool:
     """Check if target is flapping."""
-    dynamodb = get_dynamodb_resource()
-    table = dynamodb.Table(TARGET_HEALTH_TABLE)
+    key = (target_group_arn, instance_id)
+    history = _FLAP_CACHE.get(key)
+    if history is None:
+        # Cold container: seed with the last recorded state once. Only state
+        # changes are recorded, so older rows are not per-run samples.
+        history = _FLAP_CACHE[key] = deque(
+            _load_last_state(target_group_arn, instance_id),
+            maxlen=_FLAP_HISTORY_SIZE
+        )
+    history.append(state)
+    
+    return check_flapping([{'state': s} for s in history])
+
+
+def _state_changed(target_group_arn: str, instance_id: str) -> bool:
+    """Check if the latest state differs from the one before it."""
+    history = _FLAP_CACHE[(target_group_arn, instance_id)]
+    return len(history) < 2 or history[-1] != history[-2]
+
+
+def _prune_state_history(target_group_arn: str, current_ids: Set[str]):
+    """Drop state history for targets no longer registered in the group."""
+    # list() snapshots the keys; other groups' threads may insert meanwhile
+    for key in list(_FLAP_CACHE):
+        if key[0] == target_group_arn and key[1] not in current_ids:
+            _FLAP_CACHE.pop(key, None)
+
+
+def _trim_flap_cache():
+    """Evict the oldest state histories beyond _FLAP_CACHE_MAX_ENTRIES."""
+    while len(_FLAP_CACHE) > _FLAP_CACHE_MAX_ENTRIES:
+        # Dicts preserve insertion order
+        _FLAP_CACHE.pop(next(iter(_FLAP_CACHE)))
+
+
+def _seed_state_history(target_group_arn: str, instance_ids: List[str]):
+    """Seed state history for targets this container hasn't seen yet.
+    
+    Latest-state rows are read with BatchGetItem, up to 100 keys per call.
+    Targets without one fall back to _load_last_state when first checked.
+    """
+    suffix_len = len(_LATEST_EVENT_SUFFIX)
+    # One instance can be registered on several ports; BatchGetItem rejects duplicate keys
+    unseen = list(dict.fromkeys(
+        iid for iid in instance_ids if (target_group_arn, iid) not in _FLAP_CACHE
+    ))
+    if not unseen:
+        return
+    
+    try:
+        for start in range(0, len(unseen), _BATCH_GET_MAX_KEYS):
+            keys = [
+                {'EventId': f"{target_group_arn}#{iid}{_LATEST_EVENT_SUFFIX}"}
+                for iid in unseen[start:start + _BATCH_GET_MAX_KEYS]
+            ]
+            for attempt in range(_BATCH_GET_MAX_ATTEMPTS):
+                if attempt:
+                    time.sleep(0.05 * (2 ** attempt))
+                response = _READ_DDB.batch_get_item(RequestItems={
+                    TARGET_HEALTH_TABLE: {
+                        'Keys': keys,
+                        'ProjectionExpression': 'EventId, #s',
+                        'ExpressionAttributeNames': {'#s': 'State'}
+                    }
+                })
+                for item in response.get('Responses', {}).get(TARGET_HEALTH_TABLE, []):
+                    instance_id = item['EventId'][:-suffix_len].rsplit('#', 1)[-1]
+                    _FLAP_CACHE[(target_group_arn, instance_id)] = deque(
+                        [item.get('State')], maxlen=_FLAP_HISTORY_SIZE
+                    )
+                keys = response.get('UnprocessedKeys', {}).get(TARGET_HEALTH_TABLE, {}).get('Keys')
+                if not keys:
+                    break
+            if keys:
+                # Targets left unread fall back to _load_last_state
+                logger.warning("Latest state keys unprocessed", unprocessed=len(keys))
     
+    except Exception as e:
+        # Every target falls back to a GSI query, so make the failure visible
+        logger.warning("Latest state load failed", error=str(e))
+
+
+def _load_last_state(target_group_arn: str, instance_id: str) -> List[str]:
+    """Load the last recorded health state for a target (empty if none)."""
     try:
         # Get recent health events for this target
-        response = table.query(
+        response = _HEALTH_READ_TBL.query(
             IndexName='InstanceId-Timestamp-index',  # GSI
             KeyConditionExpression='InstanceId = :instance_id',
             FilterExpression='TargetGroupArn = :tg_arn',
@@ -223,90 +414,101 @@ def _check_target_flapping(target_group_arn: str, instance_id: str) -> bool:
                 ':tg_arn': target_group_arn
             },
             ScanIndexForward=False,
-            Limit=10
+            # Limit applies before the filter, so read a few rows in case the
+            # instance is registered in other target groups too
+            Limit=_FLAP_HISTORY_SIZE
         )
-        
-        health_history = response.get('Items', [])
-        if len(health_history) < 6:
-            return False
-        
-        # Check for state changes
-        states = [item.get('State') for item in health_history]
-        changes = sum(1 for i in range(1, len(states)) if states[i] != states[i-1])
-        
-        return changes >= 3
+        return [item.get('State') for item in response.get('Items', [])[:1]]
     
     except Exception as e:
-        logger.debug("Flapping check failed", error=str(e))
-        return False
+        logger.debug("Last state load failed", error=str(e))
+        return []
 
 
-def _check_aggregate_metrics(
-    target_group_arn: str,
-    targets: List[Dict[str, Any]]
-) -> List[Dict[str, Any]]:
-    """Check aggregate CloudWatch metrics for issues."""
-    issues = []
-    cw = get_cloudwatch_client()
-    
+def _get_max_unhealthy_hosts(tg_name: str) -> Optional[float]:
+    """Get the maximum UnHealthyHostCount over the last 5 minutes."""
     try:
-        # Get unhealthy host count
         end_time = datetime.utcnow()
         start_time = end_time - timedelta(minutes=5)
         
-        response = cw.get_metric_statistics(
-            Namespace='AWS/ApplicationELB',
-            MetricName='UnHealthyHostCount',
-            Dimensions=[
-                {'Name': 'TargetGroup', 'Value': target_group_arn.split('/')[-1]}
+        response = _CW.get_metric_data(
+            MetricDataQueries=[
+                {
+                    'Id': 'unhealthy',
+                    'MetricStat': {
+                        'Metric': {
+                            'Namespace': 'AWS/ApplicationELB',
+                            'MetricName': 'UnHealthyHostCount',
+                            'Dimensions': [
+                                {'Name': 'TargetGroup', 'Value': tg_name}
+                            ]
+                        },
+                        'Period': 60,
+                        'Stat': 'Maximum'
+                    }
+                }
             ],
             StartTime=start_time,
-            EndTime=end_time,
-            Period=60,
-            Statistics=['Maximum']
+            EndTime=end_time
         )
         
-        datapoints = response.get('Datapoints', [])
-        if datapoints:
-            max_unhealthy = max(dp.get('Maximum', 0) for dp in datapoints)
-            total_targets = len(targets)
-            
-            if max_unhealthy > 0:
-                unhealthy_percentage = (max_unhealthy / total_targets) * 100
-                
-                if unhealthy_percentage > 50:
-                    issues.append({
-                        'target_group_arn': target_group_arn,
-                        'issue_type': 'high_unhealthy_percentage',
-                        'unhealthy_count': max_unhealthy,
-                        'total_targets': total_targets,
-                        'percentage': unhealthy_percentage,
-                        'timestamp': datetime.utcnow().isoformat() + 'Z'
-                    })
+        results = response.get('MetricDataResults', [])
+        datapoints = results[0].get('Values', []) if results else []
+        return max(datapoints) if datapoints else None
     
     except Exception as e:
         logger.error("Aggregate metrics check failed", error=str(e))
+        return None
+
+
+def _check_aggregate_metrics(
+    target_group_arn: str,
+    max_unhealthy: Optional[float],
+    targets: List[Dict[str, Any]],
+    now_iso: str
+) -> List[Dict[str, Any]]:
+    """Check aggregate CloudWatch metrics for issues."""
+    issues = []
+    total_targets = len(targets)
+    
+    if max_unhealthy and total_targets:
+        unhealthy_percentage = (max_unhealthy / total_targets) * 100
+        
+        if unhealthy_percentage > 50:
+            issues.append({
+                'target_group_arn': target_group_arn,
+                'issue_type': 'high_unhealthy_percentage',
+                'unhealthy_count': max_unhealthy,
+                'total_targets': total_targets,
+                'percentage': unhealthy_percentage,
+                'timestamp': now_iso
+            })
     
     return issues
 
 
-def _send_issue_event(issue: Dict[str, Any]):
-    """Send issue event to EventBridge for processing."""
-    import boto3
-    eventbridge = boto3.client('events')
+def _send_issue_events(issues: List[Dict[str, Any]]):
+    """Send issue events to EventBridge for processing, 10 per PutEvents call."""
+    if not issues:
+        return
     
-    try:
-        eventbridge.put_events(
-            Entries=[
-                {
-                    'Source': 'auto-heal.target-monitor',
-                    'DetailType': issue.get('issue_type', 'target_health_issue'),
-                    'Detail': json.dumps(issue),
-                    'EventBusName': EVENT_BUS_NAME
-                }
-            ]
-        )
-        logger.info("Issue event sent", issue_type=issue.get('issue_type'))
-    except Exception as e:
-        logger.error("Failed to send issue event", error=str(e))
-
+    for start in range(0, len(issues), _PUT_EVENTS_MAX_ENTRIES):
+        chunk = issues[start:start + _PUT_EVENTS_MAX_ENTRIES]
+        try:
+            response = _EVENTS.put_events(
+                Entries=[
+                    {
+                        'Source': 'auto-heal.target-monitor',
+                        'DetailType': issue.get('issue_type', 'target_health_issue'),
+                        'Detail': dumps(issue),
+                        'EventBusName': EVENT_BUS_NAME
+                    }
+                    for issue in chunk
+                ]
+            )
+            if response.get('FailedEntryCount'):
+                logger.error("Failed to send issue events", failed=response['FailedEntryCount'])
+            logger.info("Issue events sent",
+                        issue_types=[issue.get('issue_type') for issue in chunk])
+        except Exception as e:
+            logger.error("Failed to send issue event", error=str(e))
@@ -1,56 +1,130 @@
 """AWS client utilities for Lambda functions."""
 import os
 import boto3
+from botocore.config import Config
 from typing import Optional
-from functools import lru_cache
+
+try:
+    from amazondax import AmazonDaxClient
+except ImportError:  # amazon-dax-client is optional; reads fall back to DynamoDB
+    AmazonDaxClient = None
+
+
+# Shared client configuration: a larger pool so concurrent calls from one
+# container don't queue on connections, plus adaptive retries and keep-alive
+CLIENT_CONFIG = Config(
+    max_pool_connections=50,
+    retries={'max_attempts': 3, 'mode': 'adaptive'},
+    tcp_keepalive=True
+)
+
+# The monitor's hot-path clients also skip client-side parameter validation,
+# which walks every request (e.g. each DynamoDB Item) in Python before
+# sending; malformed requests are still rejected by the service
+HOT_PATH_CLIENT_CONFIG = CLIENT_CONFIG.merge(Config(parameter_validation=False))
+
+
+# Clients are plain module globals rather than lru_cache'd, so repeat calls
+# are a global read with no cache lookup. Each is created on first use; the
+# handlers call their getters at import, so that happens during Lambda init.
+_ELBV2 = None
+_EC2 = None
+_SSM = None
+_AUTOSCALING = None
+_CLOUDWATCH = None
+_DYNAMODB = None
+_DYNAMODB_RESOURCE = None
+_SNS = None
+_EVENTS = None
+_DAX_RESOURCE = None
 
 
-@lru_cache(maxsize=1)
 def get_elbv2_client():
     """Get cached ELBv2 client."""
-    return boto3.client('elbv2')
+    global _ELBV2
+    if _ELBV2 is None:
+        _ELBV2 = boto3.client('elbv2', config=HOT_PATH_CLIENT_CONFIG)
+    return _ELBV2
 
 
-@lru_cache(maxsize=1)
 def get_ec2_client():
     """Get cached EC2 client."""
-    return boto3.client('ec2')
+    global _EC2
+    if _EC2 is None:
+        _EC2 = boto3.client('ec2', config=CLIENT_CONFIG)
+    return _EC2
 
 
-@lru_cache(maxsize=1)
 def get_ssm_client():
     """Get cached SSM client."""
-    return boto3.client('ssm')
+    global _SSM
+    if _SSM is None:
+        _SSM = boto3.client('ssm', config=CLIENT_CONFIG)
+    return _SSM
 
 
-@lru_cache(maxsize=1)
 def get_autoscaling_client():
     """Get cached Auto Scaling client."""
-    return boto3.client('autoscaling')
+    global _AUTOSCALING
+    if _AUTOSCALING is None:
+        _AUTOSCALING = boto3.client('autoscaling', config=CLIENT_CONFIG)
+    return _AUTOSCALING
 
 
-@lru_cache(maxsize=1)
 def get_cloudwatch_client():
     """Get cached CloudWatch client."""
-    return boto3.client('cloudwatch')
+    global _CLOUDWATCH
+    if _CLOUDWATCH is None:
+        _CLOUDWATCH = boto3.client('cloudwatch', config=HOT_PATH_CLIENT_CONFIG)
+    return _CLOUDWATCH
 
 
-@lru_cache(maxsize=1)
 def get_dynamodb_client():
     """Get cached DynamoDB client."""
-    return boto3.client('dynamodb')
+    global _DYNAMODB
+    if _DYNAMODB is None:
+        _DYNAMODB = boto3.client('dynamodb', config=HOT_PATH_CLIENT_CONFIG)
+    return _DYNAMODB
 
 
-@lru_cache(maxsize=1)
 def get_dynamodb_resource():
     """Get cached DynamoDB resource."""
-    return boto3.resource('dynamodb')
+    global _DYNAMODB_RESOURCE
+    if _DYNAMODB_RESOURCE is None:
+        _DYNAMODB_RESOURCE = boto3.resource('dynamodb', config=HOT_PATH_CLIENT_CONFIG)
+    return _DYNAMODB_RESOURCE
 
 
-@lru_cache(maxsize=1)
 def get_sns_client():
     """Get cached SNS client."""
-    return boto3.client('sns')
+    global _SNS
+    if _SNS is None:
+        _SNS = boto3.client('sns', config=CLIENT_CONFIG)
+    return _SNS
+
+
+def get_events_client():
+    """Get cached EventBridge client."""
+    global _EVENTS
+    if _EVENTS is None:
+        _EVENTS = boto3.client('events', config=CLIENT_CONFIG)
+    return _EVENTS
+
+
+def get_dax_resource():
+    """Get cached DynamoDB resource for reads, served by DAX when configured.
+    
+    Uses the DAX cluster at DAX_ENDPOINT when it is set and amazon-dax-client
+    is installed; otherwise returns the regular DynamoDB resource.
+    """
+    global _DAX_RESOURCE
+    if _DAX_RESOURCE is None:
+        endpoint = os.environ.get('DAX_ENDPOINT')
+        if endpoint and AmazonDaxClient is not None:
+            _DAX_RESOURCE = AmazonDaxClient.resource(endpoint_url=endpoint)
+        else:
+            _DAX_RESOURCE = get_dynamodb_resource()
+    return _DAX_RESOURCE
 
 
 def get_table(table_name: str):
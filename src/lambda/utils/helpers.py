@@ -1,6 +1,7 @@
 """Helper utilities for Lambda functions."""
 import os
-from typing import Dict, List, Optional, Any
+import time
+from typing import Dict, List, Optional, Any, Tuple
 from datetime import datetime, timedelta
 from .aws_clients import get_cloudwatch_client, get_elbv2_client
 
@@ -13,96 +14,88 @@ def get_env_var(key: str, default: Optional[str] = None) -> str:
     return value
 
 
+def iso_now() -> Tuple[str, int]:
+    """Return the current UTC time as an ISO-8601 'Z' string and epoch seconds.
+    
+    Both values come from a single clock read so they always agree.
+    """
+    now = time.time()
+    return datetime.utcfromtimestamp(now).isoformat() + 'Z', int(now)
+
+
 def parse_target_arn(target_arn: str) -> Dict[str, str]:
     """Parse target ARN into components."""
     parts = target_arn.split(':')
     return {
         'region': parts[3],
         'account_id': parts[4],
-        'target_group': parts[5].split('/')[-1],
+        'target_group': parts[5].rsplit('/', 1)[-1],
         'target_id': parts[6]
     }
 
 
+# (metrics key, CloudWatch metric name, statistics) fetched by get_target_health_metrics
+_TARGET_HEALTH_METRICS = (
+    ('unhealthy_host_count', 'UnHealthyHostCount', ('Average', 'Maximum')),
+    ('healthy_host_count', 'HealthyHostCount', ('Average', 'Maximum')),
+    ('target_response_time', 'TargetResponseTime', ('Average', 'Maximum', 'p99')),
+    ('http_5xx_count', 'HTTPCode_Target_5XX_Count', ('Sum',)),
+)
+
+
 def get_target_health_metrics(
     target_group_arn: str,
     instance_id: str,
     minutes: int = 5
 ) -> Dict[str, Any]:
-    """Get CloudWatch metrics for target health."""
+    """Get CloudWatch metrics for target health in a single GetMetricData call."""
     cw = get_cloudwatch_client()
     end_time = datetime.utcnow()
     start_time = end_time - timedelta(minutes=minutes)
+    dimensions = [{'Name': 'TargetGroup', 'Value': target_group_arn.rsplit('/', 1)[-1]}]
+    
+    # One query per (metric, statistic); Ids must start with a lowercase letter
+    queries = []
+    query_keys = {}
+    for key, metric_name, stats in _TARGET_HEALTH_METRICS:
+        for index, stat in enumerate(stats):
+            query_id = f"{key}_{index}"
+            query_keys[query_id] = (key, stat)
+            queries.append({
+                'Id': query_id,
+                'MetricStat': {
+                    'Metric': {
+                        'Namespace': 'AWS/ApplicationELB',
+                        'MetricName': metric_name,
+                        'Dimensions': dimensions
+                    },
+                    'Period': 60,
+                    'Stat': stat
+                }
+            })
     
     metrics = {}
     
-    # Get UnHealthyHostCount
     try:
-        response = cw.get_metric_statistics(
-            Namespace='AWS/ApplicationELB',
-            MetricName='UnHealthyHostCount',
-            Dimensions=[
-                {'Name': 'TargetGroup', 'Value': target_group_arn.split('/')[-1]}
-            ],
+        response = cw.get_metric_data(
+            MetricDataQueries=queries,
             StartTime=start_time,
-            EndTime=end_time,
-            Period=60,
-            Statistics=['Average', 'Maximum']
+            EndTime=end_time
         )
-        metrics['unhealthy_host_count'] = response.get('Datapoints', [])
     except Exception as e:
-        metrics['unhealthy_host_count_error'] = str(e)
+        for key, _, _ in _TARGET_HEALTH_METRICS:
+            metrics[f"{key}_error"] = str(e)
+        return metrics
     
-    # Get HealthyHostCount
-    try:
-        response = cw.get_metric_statistics(
-            Namespace='AWS/ApplicationELB',
-            MetricName='HealthyHostCount',
-            Dimensions=[
-                {'Name': 'TargetGroup', 'Value': target_group_arn.split('/')[-1]}
-            ],
-            StartTime=start_time,
-            EndTime=end_time,
-            Period=60,
-            Statistics=['Average', 'Maximum']
-        )
-        metrics['healthy_host_count'] = response.get('Datapoints', [])
-    except Exception as e:
-        metrics['healthy_host_count_error'] = str(e)
-    
-    # Get TargetResponseTime
-    try:
-        response = cw.get_metric_statistics(
-            Namespace='AWS/ApplicationELB',
-            MetricName='TargetResponseTime',
-            Dimensions=[
-                {'Name': 'TargetGroup', 'Value': target_group_arn.split('/')[-1]}
-            ],
-            StartTime=start_time,
-            EndTime=end_time,
-            Period=60,
-            Statistics=['Average', 'Maximum', 'p99']
-        )
-        metrics['target_response_time'] = response.get('Datapoints', [])
-    except Exception as e:
-        metrics['target_response_time_error'] = str(e)
+    # Rebuild get_metric_statistics-style datapoints: one dict per timestamp
+    datapoints: Dict[str, Dict[Any, Dict[str, Any]]] = {key: {} for key, _, _ in _TARGET_HEALTH_METRICS}
+    for result in response.get('MetricDataResults', []):
+        key, stat = query_keys[result['Id']]
+        for timestamp, value in zip(result.get('Timestamps', []), result.get('Values', [])):
+            datapoints[key].setdefault(timestamp, {'Timestamp': timestamp})[stat] = value
     
-    # Get HTTPCode_Target_5XX_Count
-    try:
-        response = cw.get_metric_statistics(
-            Namespace='AWS/ApplicationELB',
-            MetricName='HTTPCode_Target_5XX_Count',
-            Dimensions=[
-                {'Name': 'TargetGroup', 'Value': target_group_arn.split('/')[-1]}
-            ],
-            StartTime=start_time,
-            EndTime=end_time,
-            Period=60,
-            Statistics=['Sum']
-        )
-        metrics['http_5xx_count'] = response.get('Datapoints', [])
-    except Exception as e:
-        metrics['http_5xx_count_error'] = str(e)
+    for key, by_timestamp in datapoints.items():
+        metrics[key] = list(by_timestamp.values())
     
     return metrics
 
@@ -125,42 +118,32 @@ def check_flapping(
     return state_changes >= threshold
 
 
+# Score penalties for boolean diagnostic flags
+_FLAG_PENALTIES = (
+    ('application_failure', 40),
+    ('disk_corruption', 30),
+    ('ssm_agent_failure', 25),
+    ('network_degradation', 15),
+    ('cloudwatch_agent_failure', 10),
+)
+
+# Score penalties for usage metrics: (threshold, penalty) tiers, highest first
+_USAGE_PENALTIES = (
+    ('cpu_usage', ((90, 20), (80, 10))),
+    ('memory_usage', ((90, 20), (80, 10))),
+)
+
+
 def calculate_diagnostic_score(diagnostics: Dict[str, Any]) -> float:
     """Calculate diagnostic score (0-100, lower is worse)."""
-    score = 100.0
-    
-    # Application failures
-    if diagnostics.get('application_failure', False):
-        score -= 40
-    
-    # Resource bottlenecks
-    cpu_usage = diagnostics.get('cpu_usage', 0)
-    if cpu_usage > 90:
-        score -= 20
-    elif cpu_usage > 80:
-        score -= 10
-    
-    memory_usage = diagnostics.get('memory_usage', 0)
-    if memory_usage > 90:
-        score -= 20
-    elif memory_usage > 80:
-        score -= 10
-    
-    # Disk issues
-    if diagnostics.get('disk_corruption', False):
-        score -= 30
-    
-    # Network issues
-    if diagnostics.get('network_degradation', False):
-        score -= 15
+    penalty = sum(points for key, points in _FLAG_PENALTIES if diagnostics.get(key, False))
     
-    # Agent failures
-    if diagnostics.get('ssm_agent_failure', False):
-        score -= 25
-    if diagnostics.get('cloudwatch_agent_failure', False):
-        score -= 10
+    for key, tiers in _USAGE_PENALTIES:
+        usage = diagnostics.get(key, 0)
+        # Only the highest tier the usage exceeds applies
+        penalty += next((points for threshold, points in tiers if usage > threshold), 0)
     
-    return max(0.0, score)
+    return max(0.0, 100.0 - penalty)
 
 
 def should_replace_instance(diagnostic_score: float, repair_attempts: int) -> bool:
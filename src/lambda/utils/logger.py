@@ -2,8 +2,40 @@
 import json
 import logging
 import os
+import time
 from datetime import datetime
-from typing import Any, Dict, Optional
+from typing import Any, Dict, Optional, Tuple
+
+try:
+    import orjson
+except ImportError:  # orjson is optional; fall back to the stdlib
+    orjson = None
+
+# Fixed for the lifetime of the Lambda process
+_SERVICE = os.environ.get('AWS_LAMBDA_FUNCTION_NAME', 'unknown')
+_REQUEST_ID = os.environ.get('AWS_REQUEST_ID', 'unknown')
+
+
+def _dumps(obj: Any) -> str:
+    """Serialize a log entry to JSON, stringifying unsupported values."""
+    if orjson is not None:
+        try:
+            return orjson.dumps(obj, default=str, option=orjson.OPT_NON_STR_KEYS).decode('utf-8')
+        except TypeError:
+            pass  # e.g. integers beyond 64 bits; the stdlib handles them
+    return json.dumps(obj, default=str)
+
+
+class LazyJSON:
+    """Defer JSON serialization of a log field until the record is emitted."""
+    
+    __slots__ = ('obj',)
+    
+    def __init__(self, obj: Any):
+        self.obj = obj
+    
+    def __str__(self) -> str:
+        return _dumps(self.obj)
 
 
 class StructuredLogger:
@@ -27,31 +59,58 @@ class StructuredLogger:
             'timestamp': datetime.utcnow().isoformat() + 'Z',
             'level': level,
             'message': message,
-            'service': os.environ.get('AWS_LAMBDA_FUNCTION_NAME', 'unknown'),
-            'request_id': os.environ.get('AWS_REQUEST_ID', 'unknown'),
+            'service': _SERVICE,
+            'request_id': _REQUEST_ID,
         }
         log_entry.update(kwargs)
         return log_entry
     
+    def _emit(self, level: int, level_name: str, message: str, **kwargs):
+        """Format and emit the record only if the level is enabled."""
+        if not self.logger.isEnabledFor(level):
+            return
+        log_entry = self._format_message(level_name, message, **kwargs)
+        self.logger.log(level, _dumps(log_entry))
+    
+    def metric(
+        self,
+        message: str,
+        namespace: str,
+        metrics: Dict[str, Tuple[float, str]],
+        **kwargs
+    ):
+        """Log metrics in CloudWatch Embedded Metric Format.
+        
+        metrics maps name -> (value, unit). CloudWatch extracts them from the
+        log line, dimensioned by service, so no PutMetricData call is needed.
+        """
+        fields = {name: value for name, (value, _) in metrics.items()}
+        fields['_aws'] = {
+            'Timestamp': int(time.time() * 1000),
+            'CloudWatchMetrics': [{
+                'Namespace': namespace,
+                'Dimensions': [['service']],
+                'Metrics': [{'Name': name, 'Unit': unit} for name, (_, unit) in metrics.items()]
+            }]
+        }
+        fields.update(kwargs)
+        self._emit(logging.INFO, 'INFO', message, **fields)
+    
     def info(self, message: str, **kwargs):
         """Log info message."""
-        log_entry = self._format_message('INFO', message, **kwargs)
-        self.logger.info(json.dumps(log_entry))
+        self._emit(logging.INFO, 'INFO', message, **kwargs)
     
     def error(self, message: str, **kwargs):
         """Log error message."""
-        log_entry = self._format_message('ERROR', message, **kwargs)
-        self.logger.error(json.dumps(log_entry))
+        self._emit(logging.ERROR, 'ERROR', message, **kwargs)
     
     def warning(self, message: str, **kwargs):
         """Log warning message."""
-        log_entry = self._format_message('WARNING', message, **kwargs)
-        self.logger.warning(json.dumps(log_entry))
+        self._emit(logging.WARNING, 'WARNING', message, **kwargs)
     
     def debug(self, message: str, **kwargs):
         """Log debug message."""
-        log_entry = self._format_message('DEBUG', message, **kwargs)
-        self.logger.debug(json.dumps(log_entry))
+        self._emit(logging.DEBUG, 'DEBUG', message, **kwargs)
 
 
 def get_logger(name: str = __name__) -> StructuredLogger:
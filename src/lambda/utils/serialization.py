@@ -0,0 +1,40 @@
+"""JSON serialization utilities for Lambda functions."""
+import json
+from datetime import date, datetime, time
+from decimal import Decimal
+from uuid import UUID
+from typing import Any, Union
+
+try:
+    import orjson
+except ImportError:  # orjson is optional; fall back to the stdlib
+    orjson = None
+
+
+def _default(obj: Any) -> Any:
+    """Serialize types the JSON encoders don't handle natively.
+    
+    orjson already encodes datetime, date, time and UUID; they are handled
+    here too so the stdlib fallback accepts the same payloads.
+    """
+    if isinstance(obj, Decimal):
+        return int(obj) if obj == obj.to_integral_value() else float(obj)
+    if isinstance(obj, (datetime, date, time)):
+        return obj.isoformat()
+    if isinstance(obj, UUID):
+        return str(obj)
+    raise TypeError(f"Object of type {type(obj).__name__} is not JSON serializable")
+
+
+def dumps(obj: Any) -> str:
+    """Serialize object to a JSON string (orjson when available)."""
+    if orjson is not None:
+        return orjson.dumps(obj, default=_default).decode('utf-8')
+    return json.dumps(obj, default=_default)
+
+
+def loads(data: Union[str, bytes]) -> Any:
+    """Deserialize a JSON string or bytes (orjson when available)."""
+    if orjson is not None:
+        return orjson.loads(data)
+    return json.loads(data)
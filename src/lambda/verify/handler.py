@@ -1,16 +1,21 @@
 """Post-heal verification Lambda handler."""
-import json
+import gzip
 import os
 import time
-from typing import Dict, Any, Optional
-from datetime import datetime, timedelta
+from concurrent.futures import ThreadPoolExecutor, wait
+from typing import Dict, Any, Optional, Tuple
+from botocore.exceptions import WaiterError
 from utils.aws_clients import (
     get_elbv2_client,
+    get_ec2_client,
     get_ssm_client,
     get_cloudwatch_client,
-    get_dynamodb_resource
+    get_dynamodb_client,
+    get_sns_client
 )
 from utils.logger import get_logger
+from utils.helpers import iso_now
+from utils.serialization import dumps, loads
 
 logger = get_logger(__name__)
 
@@ -20,6 +25,43 @@ SSM_VERIFY_DOCUMENT = os.environ.get('SSM_VERIFY_DOCUMENT', 'AutoHeal-VerifyHeal
 HEALTH_CHECK_ENDPOINT = os.environ.get('HEALTH_CHECK_ENDPOINT', '/health')
 HEALTH_CHECK_TIMEOUT = int(os.environ.get('HEALTH_CHECK_TIMEOUT', '300'))  # 5 minutes
 
+# AWS clients are created once per container and reused across warm invocations
+_SSM = get_ssm_client()
+_EC2 = get_ec2_client()
+_ELBV2 = get_elbv2_client()
+_SNS = get_sns_client()
+_DDB_CLIENT = get_dynamodb_client()
+
+# EC2 instance_running waiter for replaced instances, built once with the clients
+_INSTANCE_RUNNING_WAITER = _EC2.get_waiter('instance_running')
+_INSTANCE_WAITER_DELAY_SECONDS = 5
+
+# After a replaced instance is running, poll for its SSM agent instead of a
+# fixed sleep: backoff from 1s, capped at 5s per sleep
+_SSM_READY_MAX_WAIT_SECONDS = 30
+_SSM_READY_POLL_INITIAL_SECONDS = 1.0
+_SSM_READY_POLL_MAX_SECONDS = 5.0
+
+# Verification records expire after 30 days
+_VERIFICATION_TTL_SECONDS = 30 * 24 * 3600
+
+# Stored results keep each check message to 1 KB; results whose JSON is
+# larger than 8 KB are written gzip-compressed as a Binary attribute
+_RESULT_MAX_MESSAGE_CHARS = 1024
+_RESULT_COMPRESS_MIN_BYTES = 8192
+_TRUNCATED_SUFFIX = '...[truncated]'
+
+# Checks that run through the batched SSM command
+_SSM_DEPENDENT_CHECKS = ('app_health', 'resource_usage', 'log_anomalies')
+
+# Target group health-check config rarely changes, so cache it for the life of the container
+_TG_CONFIG_TTL_SEC = 300
+_TG_CONFIG_CACHE_MAX_ENTRIES = 256
+_TG_CONFIG_CACHE: Dict[str, Tuple[float, Dict[str, Any]]] = {}
+
+# Shared pool for the independent verification checks, reused across warm invocations
+_VERIFY_POOL = ThreadPoolExecutor(max_workers=5)
+
 
 def lambda_handler(event: Dict[str, Any], context: Any) -> Dict[str, Any]:
     """
@@ -29,7 +71,7 @@ def lambda_handler(event: Dict[str, Any], context: Any) -> Dict[str, Any]:
     - EventBridge event from auto_heal
     - Scheduled verification for replaced instances
     """
-    logger.info("Verification handler started", event=json.dumps(event))
+    logger.info("Verification handler started", event=event)
     
     try:
         instance_id = _extract_instance_id(event)
@@ -43,30 +85,39 @@ def lambda_handler(event: Dict[str, Any], context: Any) -> Dict[str, Any]:
         logger.info("Verifying instance", instance_id=instance_id, action=action)
         
         # Wait for instance to be ready (if replaced)
+        instance = None
         if action == 'replace':
-            _wait_for_instance_ready(instance_id)
+            instance = _wait_for_instance_ready(instance_id)
         
         # Run verification checks
-        verification_result = _run_verification_checks(instance_id, target_group_arn)
+        verification_result = _run_verification_checks(instance_id, target_group_arn, instance)
         
-        # Store verification result
-        _store_verification_result(instance_id, target_group_arn, verification_result)
+        # Store verification result; the write overlaps re-registration and
+        # the notification, and is waited on before returning
+        pending = [_VERIFY_POOL.submit(
+            _store_verification_result, instance_id, target_group_arn, verification_result
+        )]
         
-        # Re-register if all checks pass
-        if verification_result.get('all_checks_passed'):
-            _reregister_target(instance_id, target_group_arn)
-            logger.info("Instance re-registered", instance_id=instance_id)
-        else:
-            logger.warning("Verification failed, not re-registering",
-                         instance_id=instance_id,
-                         failed_checks=verification_result.get('failed_checks', []))
-        
-        # Send notification
-        _send_verification_notification(instance_id, target_group_arn, verification_result)
+        try:
+            # Re-register if all checks pass
+            if verification_result.get('all_checks_passed'):
+                _reregister_target(instance_id, target_group_arn)
+                logger.info("Instance re-registered", instance_id=instance_id)
+            else:
+                logger.warning("Verification failed, not re-registering",
+                             instance_id=instance_id,
+                             failed_checks=verification_result.get('failed_checks', []))
+            
+            # Send notification
+            pending.append(_VERIFY_POOL.submit(
+                _send_verification_notification, instance_id, target_group_arn, verification_result
+            ))
+        finally:
+            wait(pending)
         
         return {
             'statusCode': 200,
-            'body': json.dumps(verification_result)
+            'body': dumps(verification_result)
         }
     
     except Exception as e:
@@ -76,99 +127,134 @@ def lambda_handler(event: Dict[str, Any], context: Any) -> Dict[str, Any]:
 
 def _extract_instance_id(event: Dict[str, Any]) -> Optional[str]:
     """Extract instance ID from event."""
-    if 'instance_id' in event:
-        return event['instance_id']
+    # Direct instance_id
+    instance_id = event.get('instance_id')
+    if instance_id:
+        return instance_id
+    
+    # From EventBridge detail
+    detail = event.get('detail')
+    if isinstance(detail, str):
+        detail = loads(detail)
+    return detail.get('instance_id') if isinstance(detail, dict) else None
+
+
+def _wait_for_instance_ready(instance_id: str, max_wait: int = 300) -> Dict[str, Any]:
+    """Wait for instance to be in running state and return its description."""
+    logger.info("Waiting for instance to be ready", instance_id=instance_id)
+    
+    # The waiter retries InvalidInstanceID.NotFound and fails fast once the
+    # instance is shutting down, terminated or stopping
+    try:
+        _INSTANCE_RUNNING_WAITER.wait(
+            InstanceIds=[instance_id],
+            WaiterConfig={
+                'Delay': _INSTANCE_WAITER_DELAY_SECONDS,
+                'MaxAttempts': max(1, max_wait // _INSTANCE_WAITER_DELAY_SECONDS)
+            }
+        )
+    except WaiterError as e:
+        raise Exception(f"Instance did not reach running state: {str(e)}") from e
     
-    if 'detail' in event:
-        detail = event['detail']
-        if isinstance(detail, str):
-            detail = json.loads(detail)
-        return detail.get('instance_id')
+    instance, error = _describe_instance(instance_id)
+    if instance is None:
+        raise Exception(f"Instance not found after start: {error}")
     
-    return None
+    # Wait until the SSM agent has registered
+    _wait_for_ssm_online(instance_id)
+    logger.info("Instance is running", instance_id=instance_id)
+    return instance
 
 
-def _wait_for_instance_ready(instance_id: str, max_wait: int = 300):
-    """Wait for instance to be in running state."""
-    import boto3
-    ec2 = boto3.client('ec2')
+def _wait_for_ssm_online(instance_id: str, max_wait: float = _SSM_READY_MAX_WAIT_SECONDS):
+    """Poll until the instance's SSM agent reports Online, or max_wait elapses."""
+    deadline = time.monotonic() + max_wait
+    delay = _SSM_READY_POLL_INITIAL_SECONDS
     
-    logger.info("Waiting for instance to be ready", instance_id=instance_id)
-    
-    start_time = time.time()
-    while time.time() - start_time < max_wait:
+    while True:
         try:
-            response = ec2.describe_instances(InstanceIds=[instance_id])
-            if response.get('Reservations'):
-                instance = response['Reservations'][0]['Instances'][0]
-                state = instance.get('State', {}).get('Name', '')
-                
-                if state == 'running':
-                    # Wait a bit more for initialization
-                    time.sleep(30)
-                    logger.info("Instance is running", instance_id=instance_id)
-                    return
-                elif state in ['terminated', 'stopped']:
-                    raise Exception(f"Instance is in {state} state")
-            
-            time.sleep(10)
-        
+            response = _SSM.describe_instance_information(
+                Filters=[{'Key': 'InstanceIds', 'Values': [instance_id]}]
+            )
+            instance_info = response.get('InstanceInformationList', [])
+            if instance_info and instance_info[0].get('PingStatus') == 'Online':
+                return
         except Exception as e:
-            if 'InvalidInstanceID' in str(e):
-                # Instance might not exist yet, keep waiting
-                time.sleep(10)
-                continue
-            raise
-    
-    raise Exception("Timeout waiting for instance to be ready")
+            logger.debug("SSM readiness check failed", instance_id=instance_id, error=str(e))
+        
+        remaining = deadline - time.monotonic()
+        if remaining <= 0:
+            # The ssm_online verification check reports the final status
+            logger.warning("Timed out waiting for SSM agent", instance_id=instance_id)
+            return
+        time.sleep(min(delay, remaining))
+        delay = min(delay * 2, _SSM_READY_POLL_MAX_SECONDS)
 
 
-def _run_verification_checks(instance_id: str, target_group_arn: str) -> Dict[str, Any]:
-    """Run all verification checks."""
+def _run_verification_checks(
+    instance_id: str,
+    target_group_arn: str,
+    instance: Optional[Dict[str, Any]] = None
+) -> Dict[str, Any]:
+    """Run all verification checks, reusing the instance description if given."""
     checks = {
         'instance_id': instance_id,
         'target_group_arn': target_group_arn,
-        'timestamp': datetime.utcnow().isoformat() + 'Z',
+        'timestamp': iso_now()[0],
         'all_checks_passed': False,
         'checks': {},
         'failed_checks': []
     }
     
-    # Check 1: SSM Agent online
-    checks['checks']['ssm_online'] = _check_ssm_online(instance_id)
-    if not checks['checks']['ssm_online'].get('passed'):
-        checks['failed_checks'].append('ssm_online')
+    # The checks are IO-bound; run them concurrently. The app, resource and
+    # log checks share one SSM command, sent only once the agent is online.
+    ssm_online = _VERIFY_POOL.submit(_check_ssm_online, instance_id)
+    
+    # The SSM batch and LB simulation both need the instance; describe it once
+    instance_error = None
+    if instance is None:
+        instance, instance_error = _describe_instance(instance_id)
     
-    # Check 2: Application health endpoint
-    checks['checks']['app_health'] = _check_app_health_endpoint(instance_id)
-    if not checks['checks']['app_health'].get('passed'):
-        checks['failed_checks'].append('app_health')
+    lb_health = _VERIFY_POOL.submit(_simulate_lb_health_check, target_group_arn, instance, instance_error)
     
-    # Check 3: No CPU/memory throttling
-    checks['checks']['resource_usage'] = _check_resource_usage(instance_id)
-    if not checks['checks']['resource_usage'].get('passed'):
-        checks['failed_checks'].append('resource_usage')
+    # Record results in the same order the checks used to run
+    results = {'ssm_online': ssm_online.result()}
     
-    # Check 4: Logs show no anomalies
-    checks['checks']['log_anomalies'] = _check_log_anomalies(instance_id)
-    if not checks['checks']['log_anomalies'].get('passed'):
-        checks['failed_checks'].append('log_anomalies')
+    if results['ssm_online'].get('passed'):
+        batch = _run_ssm_batch(instance_id, instance, instance_error)
+        results['app_health'] = _check_app_health_endpoint(batch)
+        results['resource_usage'] = _check_resource_usage(batch)
+        results['log_anomalies'] = _check_log_anomalies(batch)
+    else:
+        # The SSM command cannot run; fail the dependent checks without sending it
+        for name in _SSM_DEPENDENT_CHECKS:
+            results[name] = {'check': name, 'passed': False, 'message': 'Skipped: SSM agent offline'}
     
-    # Check 5: ALB/NLB health check simulation
-    checks['checks']['lb_health_simulation'] = _simulate_lb_health_check(instance_id, target_group_arn)
-    if not checks['checks']['lb_health_simulation'].get('passed'):
-        checks['failed_checks'].append('lb_health_simulation')
+    results['lb_health_simulation'] = lb_health.result()
+    
+    checks['checks'] = results
+    checks['failed_checks'] = [name for name, result in results.items() if not result.get('passed')]
     
     # All checks passed if no failed checks
-    checks['all_checks_passed'] = len(checks['failed_checks']) == 0
+    checks['all_checks_passed'] = not checks['failed_checks']
     
     return checks
 
 
+def _describe_instance(instance_id: str) -> Tuple[Optional[Dict[str, Any]], Optional[str]]:
+    """Describe an instance, returning (instance or None if not found, error message)."""
+    try:
+        response = _EC2.describe_instances(InstanceIds=[instance_id])
+    except Exception as e:
+        return None, str(e)
+    
+    if not response.get('Reservations'):
+        return None, None
+    return response['Reservations'][0]['Instances'][0], None
+
+
 def _check_ssm_online(instance_id: str) -> Dict[str, Any]:
     """Check if SSM agent is online."""
-    ssm = get_ssm_client()
-    
     result = {
         'check': 'ssm_online',
         'passed': False,
@@ -176,7 +262,7 @@ def _check_ssm_online(instance_id: str) -> Dict[str, Any]:
     }
     
     try:
-        response = ssm.describe_instance_information(
+        response = _SSM.describe_instance_information(
             Filters=[
                 {
                     'Key': 'InstanceIds',
@@ -202,77 +288,147 @@ def _check_ssm_online(instance_id: str) -> Dict[str, Any]:
     return result
 
 
-def _check_app_health_endpoint(instance_id: str) -> Dict[str, Any]:
-    """Check application health endpoint via SSM."""
-    ssm = get_ssm_client()
-    
-    result = {
-        'check': 'app_health',
-        'passed': False,
-        'message': ''
-    }
+# Each section of the batched verification script starts with a marker line
+_SECTION_MARKER = '###SECTION:'
+# CPU is sampled twice from /proc/stat ("busy total" jiffies) 200ms apart;
+# memory is (MemTotal - MemAvailable) as a percentage of MemTotal
+_CPU_SAMPLE_COMMAND = "awk '/^cpu /{print $2+$3+$4+$7+$8+$9, $2+$3+$4+$5+$6+$7+$8+$9}' /proc/stat"
+_RESOURCE_COMMANDS = [
+    _CPU_SAMPLE_COMMAND,
+    'sleep 0.2',
+    _CPU_SAMPLE_COMMAND,
+    "awk '/^MemTotal:/{t=$2} /^MemAvailable:/{a=$2} END{printf \"%.2f\\n\", (t-a)*100/t}' /proc/meminfo"
+]
+# SSM command_executed waiter: poll every second for up to 10s
+_COMMAND_EXECUTED_WAITER = _SSM.get_waiter('command_executed')
+_COMMAND_MAX_WAIT_SECONDS = 10
+_COMMAND_WAITER_DELAY_SECONDS = 1
+# grep -c prints the count itself (0 included) but exits 1 when nothing matches
+_LOG_COMMAND = "tail -n 100 /var/log/syslog 2>/dev/null | grep -Eci 'error|fatal|critical' || true"
+
+
+def _run_ssm_batch(
+    instance_id: str,
+    instance: Optional[Dict[str, Any]],
+    instance_error: Optional[str]
+) -> Dict[str, Any]:
+    """
+    Run the app health, resource and log commands in one SSM command.
     
-    try:
-        # Get instance private IP
-        import boto3
-        ec2 = boto3.client('ec2')
-        response = ec2.describe_instances(InstanceIds=[instance_id])
-        
-        if not response.get('Reservations'):
-            result['message'] = 'Instance not found'
-            return result
-        
-        instance = response['Reservations'][0]['Instances'][0]
-        private_ip = instance.get('PrivateIpAddress', '')
-        
-        if not private_ip:
-            result['message'] = 'No private IP found'
-            return result
-        
+    Returns the output of each section keyed by name, plus 'app_error' when
+    the health endpoint could not be curled and 'error' when the command
+    itself failed.
+    """
+    batch = {'sections': {}}
+    commands = []
+    
+    private_ip = instance.get('PrivateIpAddress', '') if instance else ''
+    
+    if instance_error:
+        batch['app_error'] = f'Error checking app health: {instance_error}'
+    elif instance is None:
+        batch['app_error'] = 'Instance not found'
+    elif not private_ip:
+        batch['app_error'] = 'No private IP found'
+    else:
         # Try to curl health endpoint
         health_endpoint = os.environ.get('HEALTH_CHECK_ENDPOINT', '/health')
         port = os.environ.get('HEALTH_CHECK_PORT', '80')
-        
-        command = f"curl -f -s -o /dev/null -w '%{{http_code}}' --max-time 5 http://{private_ip}:{port}{health_endpoint} || echo 'FAILED'"
-        
-        ssm_response = ssm.send_command(
+        commands += [
+            f'echo "{_SECTION_MARKER}app"',
+            f"curl -f -s -o /dev/null -w '%{{http_code}}' --max-time 5 http://{private_ip}:{port}{health_endpoint} || echo 'FAILED'",
+            'echo'
+        ]
+    
+    commands += [f'echo "{_SECTION_MARKER}resources"'] + _RESOURCE_COMMANDS
+    commands += ['echo', f'echo "{_SECTION_MARKER}logs"', _LOG_COMMAND]
+    
+    try:
+        ssm_response = _SSM.send_command(
             InstanceIds=[instance_id],
             DocumentName='AWS-RunShellScript',
-            Parameters={
-                'commands': [command]
-            }
+            Parameters={'commands': commands}
         )
         
         command_id = ssm_response.get('Command', {}).get('CommandId')
         
-        # Wait and get result (simplified)
-        time.sleep(3)
-        try:
-            cmd_result = ssm.get_command_invocation(
-                CommandId=command_id,
-                InstanceId=instance_id
-            )
-            output = cmd_result.get('StandardOutputContent', '').strip()
-            
-            if output == '200' or output.startswith('2'):
-                result['passed'] = True
-                result['message'] = f'Health endpoint returned {output}'
-            else:
-                result['message'] = f'Health endpoint returned {output}'
+        cmd_result = _wait_for_ssm_command(command_id, instance_id)
+        if cmd_result is None:
+            raise RuntimeError('Command invocation not found')
         
-        except Exception as e:
-            result['message'] = f'Error getting command result: {str(e)}'
+        current = None
+        for line in cmd_result.get('StandardOutputContent', '').splitlines():
+            if line.startswith(_SECTION_MARKER):
+                current = line[len(_SECTION_MARKER):].strip()
+                batch['sections'][current] = []
+            elif current is not None and line.strip():
+                batch['sections'][current].append(line.strip())
     
     except Exception as e:
-        result['message'] = f'Error checking app health: {str(e)}'
+        batch['error'] = str(e)
     
-    return result
+    return batch
 
 
-def _check_resource_usage(instance_id: str) -> Dict[str, Any]:
-    """Check CPU and memory usage."""
-    ssm = get_ssm_client()
+def _wait_for_ssm_command(
+    command_id: str,
+    instance_id: str,
+    max_wait: int = _COMMAND_MAX_WAIT_SECONDS
+) -> Optional[Dict[str, Any]]:
+    """
+    Wait for an SSM command with the command_executed waiter.
+    
+    Returns the invocation once it succeeds, the last invocation seen if it
+    failed or max_wait elapsed, or None if the invocation never became visible.
+    """
+    try:
+        # Retries InvocationDoesNotExist until the command has registered
+        _COMMAND_EXECUTED_WAITER.wait(
+            CommandId=command_id,
+            InstanceId=instance_id,
+            WaiterConfig={
+                'Delay': _COMMAND_WAITER_DELAY_SECONDS,
+                'MaxAttempts': max(1, max_wait // _COMMAND_WAITER_DELAY_SECONDS)
+            }
+        )
+    except WaiterError as e:
+        # Failed commands still carry the output of the sections that ran
+        logger.warning("SSM command did not succeed", command_id=command_id, error=str(e))
+        response = e.last_response or {}
+        return None if 'Error' in response else response
+    
+    return _SSM.get_command_invocation(CommandId=command_id, InstanceId=instance_id)
+
+
+def _check_app_health_endpoint(batch: Dict[str, Any]) -> Dict[str, Any]:
+    """Check application health endpoint from the batched SSM output."""
+    result = {
+        'check': 'app_health',
+        'passed': False,
+        'message': ''
+    }
+    
+    if batch.get('app_error'):
+        result['message'] = batch['app_error']
+        return result
+    
+    if batch.get('error'):
+        result['message'] = f"Error getting command result: {batch['error']}"
+        return result
+    
+    output = ''.join(batch['sections'].get('app', []))
+    
+    if output == '200' or output.startswith('2'):
+        result['passed'] = True
+        result['message'] = f'Health endpoint returned {output}'
+    else:
+        result['message'] = f'Health endpoint returned {output}'
     
+    return result
+
+
+def _check_resource_usage(batch: Dict[str, Any]) -> Dict[str, Any]:
+    """Check CPU and memory usage from the batched SSM output."""
     result = {
         'check': 'resource_usage',
         'passed': False,
@@ -282,30 +438,16 @@ def _check_resource_usage(instance_id: str) -> Dict[str, Any]:
     }
     
     try:
-        commands = [
-            "top -bn1 | grep 'Cpu(s)' | awk '{print $2}' | cut -d'%' -f1",
-            "free -m | awk 'NR==2{printf \"%.2f\", $3*100/$2}'"
-        ]
+        if batch.get('error'):
+            raise RuntimeError(batch['error'])
         
-        ssm_response = ssm.send_command(
-            InstanceIds=[instance_id],
-            DocumentName='AWS-RunShellScript',
-            Parameters={'commands': commands}
-        )
+        output = batch['sections'].get('resources', [])
         
-        command_id = ssm_response.get('Command', {}).get('CommandId')
-        time.sleep(3)
-        
-        cmd_result = ssm.get_command_invocation(
-            CommandId=command_id,
-            InstanceId=instance_id
-        )
-        
-        output = cmd_result.get('StandardOutputContent', '').strip().split('\n')
-        
-        if len(output) >= 2:
-            cpu_usage = float(output[0].strip())
-            memory_usage = float(output[1].strip())
+        if len(output) >= 3:
+            busy_start, total_start = map(int, output[0].split())
+            busy_end, total_end = map(int, output[1].split())
+            cpu_usage = round((busy_end - busy_start) * 100 / max(total_end - total_start, 1), 2)
+            memory_usage = float(output[2])
             
             result['cpu_usage'] = cpu_usage
             result['memory_usage'] = memory_usage
@@ -322,10 +464,8 @@ def _check_resource_usage(instance_id: str) -> Dict[str, Any]:
     return result
 
 
-def _check_log_anomalies(instance_id: str) -> Dict[str, Any]:
-    """Check logs for anomalies."""
-    ssm = get_ssm_client()
-    
+def _check_log_anomalies(batch: Dict[str, Any]) -> Dict[str, Any]:
+    """Check logs for anomalies from the batched SSM output."""
     result = {
         'check': 'log_anomalies',
         'passed': False,
@@ -333,24 +473,11 @@ def _check_log_anomalies(instance_id: str) -> Dict[str, Any]:
     }
     
     try:
-        # Check for recent errors in syslog
-        command = "tail -n 100 /var/log/syslog 2>/dev/null | grep -i 'error\\|fatal\\|critical' | wc -l || echo '0'"
-        
-        ssm_response = ssm.send_command(
-            InstanceIds=[instance_id],
-            DocumentName='AWS-RunShellScript',
-            Parameters={'commands': [command]}
-        )
-        
-        command_id = ssm_response.get('Command', {}).get('CommandId')
-        time.sleep(3)
-        
-        cmd_result = ssm.get_command_invocation(
-            CommandId=command_id,
-            InstanceId=instance_id
-        )
+        if batch.get('error'):
+            raise RuntimeError(batch['error'])
         
-        error_count = int(cmd_result.get('StandardOutputContent', '0').strip())
+        # Check for recent errors in syslog
+        error_count = int(''.join(batch['sections'].get('logs', [])) or '0')
         
         if error_count < 10:
             result['passed'] = True
@@ -366,10 +493,12 @@ def _check_log_anomalies(instance_id: str) -> Dict[str, Any]:
     return result
 
 
-def _simulate_lb_health_check(instance_id: str, target_group_arn: str) -> Dict[str, Any]:
+def _simulate_lb_health_check(
+    target_group_arn: str,
+    instance: Optional[Dict[str, Any]],
+    instance_error: Optional[str]
+) -> Dict[str, Any]:
     """Simulate load balancer health check."""
-    elbv2 = get_elbv2_client()
-    
     result = {
         'check': 'lb_health_simulation',
         'passed': False,
@@ -378,23 +507,20 @@ def _simulate_lb_health_check(instance_id: str, target_group_arn: str) -> Dict[s
     
     try:
         # Get target group health check configuration
-        response = elbv2.describe_target_groups(TargetGroupArns=[target_group_arn])
-        tg = response['TargetGroups'][0]
+        tg = _get_target_group_config(target_group_arn)
         
         health_check_path = tg.get('HealthCheckPath', '/')
         health_check_port = tg.get('HealthCheckPort', 'traffic-port')
         health_check_protocol = tg.get('HealthCheckProtocol', 'HTTP')
         
         # Try to check health via SSM
-        import boto3
-        ec2 = boto3.client('ec2')
-        instance_response = ec2.describe_instances(InstanceIds=[instance_id])
+        if instance_error:
+            raise RuntimeError(instance_error)
         
-        if not instance_response.get('Reservations'):
+        if instance is None:
             result['message'] = 'Instance not found'
             return result
         
-        instance = instance_response['Reservations'][0]['Instances'][0]
         private_ip = instance.get('PrivateIpAddress', '')
         
         # For now, just verify instance is reachable
@@ -408,12 +534,27 @@ def _simulate_lb_health_check(instance_id: str, target_group_arn: str) -> Dict[s
     return result
 
 
+def _get_target_group_config(target_group_arn: str) -> Dict[str, Any]:
+    """Get target group configuration from ELBv2 (cached for _TG_CONFIG_TTL_SEC)."""
+    entry = _TG_CONFIG_CACHE.get(target_group_arn)
+    if entry and time.monotonic() - entry[0] < _TG_CONFIG_TTL_SEC:
+        return entry[1]
+    
+    response = _ELBV2.describe_target_groups(TargetGroupArns=[target_group_arn])
+    tg = response['TargetGroups'][0]
+    
+    _TG_CONFIG_CACHE.pop(target_group_arn, None)
+    if len(_TG_CONFIG_CACHE) >= _TG_CONFIG_CACHE_MAX_ENTRIES:
+        # Evict the oldest entry (dicts preserve insertion order)
+        _TG_CONFIG_CACHE.pop(next(iter(_TG_CONFIG_CACHE)))
+    _TG_CONFIG_CACHE[target_group_arn] = (time.monotonic(), tg)
+    return tg
+
+
 def _reregister_target(instance_id: str, target_group_arn: str):
     """Re-register instance to target group."""
-    elbv2 = get_elbv2_client()
-    
     try:
-        elbv2.register_targets(
+        _ELBV2.register_targets(
             TargetGroupArn=target_group_arn,
             Targets=[{'Id': instance_id}]
         )
@@ -423,26 +564,54 @@ def _reregister_target(instance_id: str, target_group_arn: str):
         raise
 
 
+def _compact_result(result: Dict[str, Any]) -> Dict[str, Any]:
+    """Keep the fields worth storing from a verification result, capping messages."""
+    checks = {}
+    for name, check in result.get('checks', {}).items():
+        # 'check' repeats the key; everything else (passed, metrics) is kept
+        compact = {k: v for k, v in check.items() if k != 'check'}
+        message = compact.get('message') or ''
+        if len(message) > _RESULT_MAX_MESSAGE_CHARS:
+            compact['message'] = message[:_RESULT_MAX_MESSAGE_CHARS] + _TRUNCATED_SUFFIX
+        checks[name] = compact
+    
+    return {
+        'instance_id': result.get('instance_id'),
+        'target_group_arn': result.get('target_group_arn'),
+        'timestamp': result.get('timestamp'),
+        'all_checks_passed': result.get('all_checks_passed'),
+        'failed_checks': result.get('failed_checks', []),
+        'checks': checks
+    }
+
+
 def _store_verification_result(
     instance_id: str,
     target_group_arn: str,
     result: Dict[str, Any]
 ):
     """Store verification result in DynamoDB."""
-    dynamodb = get_dynamodb_resource()
-    table = dynamodb.Table(VERIFICATION_TABLE)
+    now_iso, now_epoch = iso_now()
     
     try:
-        table.put_item(
-            Item={
-                'VerificationId': f"{instance_id}#{datetime.utcnow().isoformat()}",
-                'InstanceId': instance_id,
-                'TargetGroupArn': target_group_arn,
-                'Result': result,
-                'Timestamp': datetime.utcnow().isoformat() + 'Z',
-                'TTL': int((datetime.utcnow() + timedelta(days=30)).timestamp())
-            }
-        )
+        # Built directly in DynamoDB's typed format for the low-level client
+        item = {
+            'VerificationId': {'S': f"{instance_id}#{now_iso[:-1]}"},
+            'InstanceId': {'S': instance_id},
+            'TargetGroupArn': {'S': target_group_arn},
+            'Timestamp': {'S': now_iso},
+            'TTL': {'N': str(now_epoch + _VERIFICATION_TTL_SECONDS)}
+        }
+        
+        # Stored as one JSON attribute instead of a nested map
+        payload = dumps(_compact_result(result)).encode('utf-8')
+        if len(payload) > _RESULT_COMPRESS_MIN_BYTES:
+            item['Result'] = {'B': gzip.compress(payload, compresslevel=6)}
+            item['ResultEncoding'] = {'S': 'gzip'}
+        else:
+            item['Result'] = {'S': payload.decode('utf-8')}
+        
+        _DDB_CLIENT.put_item(TableName=VERIFICATION_TABLE, Item=item)
     except Exception as e:
         logger.error("Failed to store verification result", error=str(e))
 
@@ -453,9 +622,6 @@ def _send_verification_notification(
     result: Dict[str, Any]
 ):
     """Send verification notification."""
-    import boto3
-    sns = boto3.client('sns')
-    
     topic_arn = os.environ.get('SNS_TOPIC_ARN', '')
     if not topic_arn:
         return
@@ -470,10 +636,10 @@ def _send_verification_notification(
             'timestamp': result.get('timestamp')
         }
         
-        sns.publish(
+        _SNS.publish(
             TopicArn=topic_arn,
             Subject=f"Auto-Heal Verification: {instance_id}",
-            Message=json.dumps(message, indent=2)
+            Message=dumps(message)
         )
     
     except Exception as e: